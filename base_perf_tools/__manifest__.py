@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+{
+    'name': 'Performance Tools',
+    'version': '17.0.1.0',
+    'category': 'Hidden/Tools',
+    'summary': 'Benchmark and query plan helpers shared by the HR addons',
+    'description': """
+Helpers used from an Odoo shell and from the tests of the HR addons: the
+EXPLAIN check of their query shapes, the measurement and reporting of their
+benchmark suites, and the query count guard of their hot paths. It adds no
+model and no data, so the addons import it without depending on it.
+""",
+    'depends': [
+        'base',
+    ],
+    'data': [],
+    'installable': True,
+    'application': False,
+    'license': 'LGPL-3',
+}
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+""" Query count guard of the hot paths of the addons.
+
+A hot path is run at each of ``QueryCountCase.SIZES`` and must make the same
+number of queries every time, below a bound well under the number of
+records: a query per record fails the test. The timings at scale are
+measured by the benchmarks, see ``tools/benchmark.py``.
+"""
+from odoo.tests import TransactionCase
+
+
+class QueryCountCase(TransactionCase):
+
+    # Number of records each hot path is run on
+    SIZES = (20, 100)
+
+    def assertStableQueryCount(self, maximum, setup, run):
+        """ For each of ``SIZES``, seed the records with ``setup(size)``, then
+        call ``run`` on them on cold caches. Each run must make at most
+        ``maximum`` queries, flush included, and the same number at every size.
+
+        :return: ``{size: seeded records}``, for the assertions on the results
+        """
+        seeded = {}
+        counts = {}
+        for size in self.SIZES:
+            seeded[size] = setup(size)
+            self.env.flush_all()
+            self.env.invalidate_all()
+            start = self.cr.sql_log_count
+            with self.assertQueryCount(maximum):
+                run(seeded[size])
+            counts[size] = self.cr.sql_log_count - start
+        self.assertEqual(len(set(counts.values())), 1,
+                         f"The query count grows with the number of records: {counts}")
+        return seeded
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+""" Measurement and reporting of the benchmark suites of the addons.
+
+Each addon defines its benchmarks and lists them as ``SUITE`` in its own
+``tools/benchmark.py``; a benchmark seeds its data, then times the hot path
+with ``measure``. They are meant to be run from an Odoo shell on a
+disposable database, one at a time or as a whole suite with ``run_suite``::
+
+    $ odoo-bin shell -d bench_db
+    >>> from odoo.addons.hr_appraisal.tools import benchmark
+    >>> benchmark.bench_generate_appraisals(env, employees=6000)
+    >>> from odoo.addons.base_perf_tools.tools.benchmark import run_suite
+    >>> run_suite(env, 'hr_appraisal', scales=[1000], output='/tmp/hr_appraisal.json')
+
+Nothing is committed: the shell rolls the transaction back on exit unless
+``env.cr.commit()`` is called explicitly. The query counts of the hot paths
+are also guarded by the tests of each addon, see ``tests/common.py``.
+
+Peak memory is measured with ``tracemalloc``, which slows Python code down:
+compare wall times between runs, not with production timings.
+"""
+import importlib
+import json
+import logging
+import time
+import tracemalloc
+
+from odoo import release
+
+_logger = logging.getLogger(__name__)
+
+
+def create_employees(env, count, prefix="Bench", department_size=50):
+    """ Create ``count`` employees spread over departments of
+    ``department_size`` people, the first employee of each department being
+    the manager of the others. Requires the ``hr`` addon. """
+    departments = env['hr.department'].create([
+        {'name': f"{prefix} Department {index}"}
+        for index in range(max(1, count // department_size))
+    ])
+    managers = env['hr.employee'].create([
+        {'name': f"{prefix} Manager {index}", 'department_id': department.id}
+        for index, department in enumerate(departments)
+    ])
+    employees = env['hr.employee'].create([
+        {
+            'name': f"{prefix} Employee {index}",
+            'department_id': departments[index % len(departments)].id,
+            'parent_id': managers[index % len(departments)].id,
+        }
+        for index in range(count - len(managers))
+    ])
+    return managers + employees
+
+
+def measure(env, label, func, size):
+    """ Call ``func`` on cold caches and return its wall time, query count and
+    peak memory, for ``size`` processed items. """
+    env.flush_all()
+    env.invalidate_all()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    queries = env.cr.sql_log_count
+    start = time.perf_counter()
+    func()
+    env.flush_all()
+    elapsed = time.perf_counter() - start
+    _current, peak = tracemalloc.get_traced_memory()
+    if not tracing:
+        tracemalloc.stop()
+    result = {
+        'benchmark': label,
+        'size': size,
+        'seconds': round(elapsed, 3),
+        'seconds_per_1k': round(elapsed * 1000 / size, 3) if size else 0.0,
+        'per_second': round(size / elapsed, 1) if elapsed else 0.0,
+        'queries': env.cr.sql_log_count - queries,
+        'peak_memory_mb': round(peak / 2 ** 20, 1),
+    }
+    _logger.info("%(benchmark)s: size=%(size)s seconds=%(seconds)s seconds_per_1k=%(seconds_per_1k)s "
+                 "per_second=%(per_second)s queries=%(queries)s peak_memory_mb=%(peak_memory_mb)s", result)
+    return result
+
+
+def run_suite(env, module, scales=(1000, 10000, 50000), output=None):
+    """ Run every benchmark of the ``SUITE`` of ``module``, a list of
+    ``(benchmark, keyword argument set to the scale, other arguments)``, at
+    each scale and return the results.
+
+    Each run happens in a savepoint rolled back afterwards, so the scales do
+    not pile up. With ``output``, the results are also written to that JSON
+    file, to be diffed against the file of another version.
+    """
+    suite = importlib.import_module(f'odoo.addons.{module}.tools.benchmark').SUITE
+    results = []
+    for scale in scales:
+        for bench, keyword, extra in suite:
+            with env.cr.savepoint() as savepoint:
+                results.append(dict(bench(env, **{keyword: scale}, **extra), scale=scale))
+                savepoint.rollback()
+            env.invalidate_all()
+    if output:
+        with open(output, 'w') as report:
+            json.dump({'module': module, 'version': release.version, 'results': results}, report, indent=2)
+    return results
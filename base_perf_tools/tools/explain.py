@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+""" EXPLAIN check of query shapes.
+
+Each addon lists the lookups it makes and the ones of its record rules as
+``QUERY_SHAPES``, a dict ``{label: (query, params)}``, in its own
+``tools/explain.py``. ``check_query_plans`` checks them from its tests, or
+from an Odoo shell after seeding data with the benchmarks to look at real
+plans::
+
+    $ odoo-bin shell -d bench_db
+    >>> from odoo.addons.base_perf_tools.tools.explain import check_query_plans
+    >>> check_query_plans(env, 'hr_appraisal')
+    {}
+
+Sequential scans are disabled during the check, so the planner only picks
+one when no index can serve the query: the result does not depend on the
+size of the tables.
+"""
+import importlib
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def seq_scans(node):
+    """ Yield the relations read by a sequential scan in an EXPLAIN plan. """
+    if node.get('Node Type') == 'Seq Scan':
+        yield node['Relation Name']
+    for child in node.get('Plans', []):
+        yield from seq_scans(child)
+
+
+def check_query_plans(env, module):
+    """ EXPLAIN every query of the ``QUERY_SHAPES`` of ``module`` with
+    sequential scans disabled and return ``{label: [relations]}`` for the
+    queries that still plan to a sequential scan, i.e. that no index serves.
+    An empty dict means every query shape is covered. """
+    shapes = importlib.import_module(f'odoo.addons.{module}.tools.explain').QUERY_SHAPES
+    env.flush_all()
+    failures = {}
+    env.cr.execute("SET enable_seqscan = off")
+    try:
+        for label, (query, params) in shapes.items():
+            env.cr.execute(f"EXPLAIN (FORMAT JSON) {query}", params)
+            [plan] = env.cr.fetchone()[0]
+            relations = list(seq_scans(plan['Plan']))
+            if relations:
+                failures[label] = relations
+                _logger.warning("%s: sequential scan on %s", label, ", ".join(relations))
+    finally:
+        env.cr.execute("RESET enable_seqscan")
+    _logger.info("%s: %s query shape(s) checked, %s without index", module, len(shapes), len(failures))
+    return failures
@@ -11,14 +11,21 @@ class HREmployee(models.Model):
 
     training_count = fields.Integer(
         string='Trainings',
-        compute='_compute_training_count'
+        compute='_compute_training_count',
+        store=True
     )
 
+    @api.depends('training_trainee_ids')
     def _compute_training_count(self):
+        # Stored and recomputed by the ORM only for the employees whose
+        # trainee lines change, with one grouped count per batch
+        counts = dict(self.env['hr.training.trainee']._read_group(
+            [('employee_id', 'in', self._origin.ids)],
+            ['employee_id'],
+            ['__count'],
+        ))
         for employee in self:
-            employee.training_count = self.env['hr.training.trainee'].search_count([
-                ('employee_id', '=', employee.id)
-            ])
+            employee.training_count = counts.get(employee._origin, 0)
 
     def action_view_trainings(self):
         self.ensure_one()
@@ -19,7 +19,8 @@ class Training(models.Model):
     employee_id = fields.Many2one(
         'hr.employee',
         string="Employee Supervising",
-        required=True
+        required=True,
+        index=True
     )
 
     department_id = fields.Many2one(
@@ -109,12 +110,13 @@ class TrainingTrainee(models.Model):
     _name = "hr.training.trainee"
     _description = "List of trainees who attended a training"
 
-    training_id = fields.Many2one('hr.training', string="Training")
+    training_id = fields.Many2one('hr.training', string="Training", index=True)
 
     employee_id = fields.Many2one(
         'hr.employee',
         string="Trainee",
-        required=True
+        required=True,
+        index=True
     )
 
 
@@ -125,7 +127,7 @@ class HrTrainingAttachment(models.Model):
     _description = 'Training Attachments'
 
     name = fields.Char(string='Attachment Name', required=True)
-    training_id = fields.Many2one('hr.training', string='Training', required=True, ondelete='cascade')
+    training_id = fields.Many2one('hr.training', string='Training', required=True, ondelete='cascade', index=True)
     attachment = fields.Binary(string='File', required=True)
     attachment_type = fields.Selection(
         selection=[
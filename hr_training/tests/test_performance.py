@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import Command
+from odoo.tests import tagged
+from odoo.addons.base_perf_tools.tests.common import QueryCountCase
+
+
+@tagged('post_install', '-at_install')
+class TestPerformance(QueryCountCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.supervisor = cls.env['hr.employee'].create({'name': "Perf Supervisor"})
+
+    def test_training_count(self):
+        def setup(size):
+            employees = self.env['hr.employee'].create([
+                {'name': f"Perf Trainee {size} {index}"}
+                for index in range(size)
+            ])
+            training = self.env['hr.training'].create({
+                'name': f"Perf Training {size}",
+                'employee_id': self.supervisor.id,
+            })
+            return training, employees
+
+        def add_trainees(seeded):
+            training, employees = seeded
+            training.write({
+                'trainee_ids': [Command.create({'employee_id': employee.id}) for employee in employees],
+            })
+
+        # Recomputed with one grouped count for every trainee added
+        seeded = self.assertStableQueryCount(10, setup, add_trainees)
+        self.assertStableQueryCount(3, lambda size: seeded[size][1], lambda employees: employees.mapped('training_count'))
+        for _training, employees in seeded.values():
+            self.assertEqual(set(employees.mapped('training_count')), {1})
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import Command
+from odoo.tests import TransactionCase, tagged
+from odoo.addons.base_perf_tools.tools.explain import check_query_plans
+
+
+@tagged('post_install', '-at_install')
+class TestQueryPlans(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        employees = cls.env['hr.employee'].create([
+            {'name': f"Plans Employee {index}"}
+            for index in range(5)
+        ])
+        cls.env['hr.training'].create({
+            'name': "Plans Training",
+            'employee_id': employees[0].id,
+            'trainee_ids': [Command.create({'employee_id': employee.id}) for employee in employees],
+        })
+
+    def test_query_shapes_use_indexes(self):
+        self.assertEqual(check_query_plans(self.env, 'hr_training'), {})
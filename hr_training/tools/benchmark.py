@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+""" Benchmarks of the hot paths of the training module, run by
+``base_perf_tools.tools.benchmark.run_suite``. """
+from odoo import Command
+from odoo.addons.base_perf_tools.tools.benchmark import measure
+
+
+def bench_training_count(env, employees=1000, trainings=20):
+    """ Read ``training_count`` on ``employees`` new employees, as the list
+    and kanban views do. The query count must not grow with the number of
+    employees. """
+    supervisor = env['hr.employee'].create({'name': "Bench Supervisor"})
+    staff = env['hr.employee'].create([{'name': f"Bench Trainee {index}"} for index in range(employees)])
+    env['hr.training'].create([
+        {
+            'name': f"Bench Training {index}",
+            'employee_id': supervisor.id,
+            'trainee_ids': [Command.create({'employee_id': employee.id}) for employee in staff[index::trainings]],
+        }
+        for index in range(trainings)
+    ])
+    return measure(env, 'training_count', lambda: staff.mapped('training_count'), employees)
+
+
+# (benchmark, keyword argument set to the scale, other arguments)
+SUITE = [
+    (bench_training_count, 'employees', {}),
+]
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+""" Lookups of the training module and its record rules, checked by
+``base_perf_tools.tools.explain.check_query_plans``. """
+
+QUERY_SHAPES = {
+    'trainee_by_employee': (
+        "SELECT id FROM hr_training_trainee WHERE employee_id = %s",
+        [0],
+    ),
+    'trainee_by_training': (
+        "SELECT id FROM hr_training_trainee WHERE training_id = %s",
+        [0],
+    ),
+    'training_by_supervisor': (
+        "SELECT id FROM hr_training WHERE employee_id = %s",
+        [0],
+    ),
+    'attachment_by_training': (
+        "SELECT id FROM hr_training_attachment WHERE training_id = %s",
+        [0],
+    ),
+}
+
@@ -1,6 +1,6 @@
 {
     'name': 'HR Appraisal and 360 Reviews',
-    'version': '17.0',
+    'version': '17.0.17.1',
     'category': 'Human Resources',
     'author': 'Pliny Solutions',
     'website': 'https://plinysolutions.com/odoo',
@@ -19,13 +19,18 @@
         'security/ir.model.access.csv',
         'security/appraisal_record_rules.xml',
         'data/mail_template.xml',
+        'data/ir_cron.xml',
+        'data/ir_actions_server.xml',
         'data/appraisal_score.xml',
         'data/appraisal_category.xml',
         'views/add_employees.xml',
+        'views/appraisal_import.xml',
         'views/hr_appraisal.xml',
         'views/hr_threesixty_plan.xml',
         'views/hr_threesixty.xml',
+        'views/hr_threesixty_feedback.xml',
         'views/hr_appraisal_plan.xml',
+        'views/hr_appraisal_analysis.xml',
         'views/hr_appraisal_views.xml',
     ],
     'installable': True,
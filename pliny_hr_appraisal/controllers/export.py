@@ -0,0 +1,162 @@
+import csv
+import io
+import tempfile
+
+import xlsxwriter
+from werkzeug.exceptions import NotFound
+
+from odoo import _, http
+from odoo.exceptions import AccessError
+from odoo.http import request, content_disposition
+
+# Rows fetched per round trip from the server-side cursor
+FETCH_SIZE = 2000
+# Bytes per chunk when streaming the generated XLSX file
+CHUNK_SIZE = 64 * 1024
+# Rows per worksheet, the last row of the XLSX format being kept for the header
+XLSX_MAX_ROWS = 1048575
+
+APPRAISAL_COLUMNS = [
+    "Employee", "Department", "Job Title", "Manager", "Status", "Question",
+    "Maximum Score", "Employee Score", "Manager Score", "Employee Comments", "Manager Comments",
+]
+APPRAISAL_QUERY = """
+    SELECT employee.name, appraisal.department_id, appraisal.job_id, manager.name, appraisal.state,
+           line.name, line.maximum_value, question.employee_value, question.manager_value,
+           question.employee_comment, question.manager_comment
+      FROM hr_appraisal_question question
+      JOIN hr_appraisal appraisal ON appraisal.id = question.appraisal_id
+      JOIN hr_appraisal_question_template_line line ON line.id = question.template_line_id
+      JOIN hr_employee employee ON employee.id = appraisal.employee_id
+ LEFT JOIN hr_employee manager ON manager.id = appraisal.manager_id
+     WHERE appraisal.plan_id = %s
+  ORDER BY employee.name, appraisal.id, line.sequence, line.id
+"""
+
+THREESIXTY_COLUMNS = [
+    "Reviewed", "Department", "Job Title", "Reviewer", "Status", "Question",
+    "Maximum Score", "Reviewer Score", "Reviewer Comments",
+]
+THREESIXTY_QUERY = """
+    SELECT reviewed.name, review.department_id, review.job_id, reviewer.name, review.state,
+           line.name, line.maximum_value, question.reviewer_value, question.reviewer_comment
+      FROM hr_threesixty_review_question question
+      JOIN hr_threesixty_review review ON review.id = question.review_id
+      JOIN hr_appraisal_question_template_line line ON line.id = question.template_line_id
+      JOIN hr_employee reviewed ON reviewed.id = review.reviewed_id
+      JOIN hr_employee reviewer ON reviewer.id = review.reviewer_id
+     WHERE review.plan_id = %s
+  ORDER BY reviewed.name, review.reviewed_id, reviewer.name, review.id, line.sequence, line.id
+"""
+
+
+class AppraisalExportController(http.Controller):
+
+    @http.route('/hr_appraisal/export/appraisal/<int:plan_id>/<string:file_format>', type='http', auth='user')
+    def export_appraisal_results(self, plan_id, file_format):
+        return self._export(
+            'hr.appraisal.plan', 'hr.appraisal', plan_id, file_format,
+            APPRAISAL_COLUMNS, APPRAISAL_QUERY,
+        )
+
+    @http.route('/hr_appraisal/export/threesixty/<int:plan_id>/<string:file_format>', type='http', auth='user')
+    def export_threesixty_results(self, plan_id, file_format):
+        return self._export(
+            'hr.threesixty.plan', 'hr.threesixty.review', plan_id, file_format,
+            THREESIXTY_COLUMNS, THREESIXTY_QUERY,
+        )
+
+    def _export(self, plan_model, result_model, plan_id, file_format, columns, query):
+        """ Stream the answers of a plan as CSV or XLSX.
+
+        The rows are read through a server-side cursor in a cursor of their
+        own, since the response body is produced after the request cursor is
+        closed, so only ``FETCH_SIZE`` rows are ever held in memory.
+        Department, job and state labels are resolved from small maps built
+        beforehand with the ORM.
+        """
+        if file_format not in ('csv', 'xlsx'):
+            raise NotFound()
+        if not request.env.user.has_group('hr_appraisal.group_appraisal_hr'):
+            raise AccessError(_("Only HR officers can export appraisal results."))
+        plan = request.env[plan_model].browse(plan_id).exists()
+        if not plan:
+            raise NotFound()
+        plan.check_access_rule('read')
+
+        Result = request.env[result_model]
+        labels = {
+            'department': {department.id: department.display_name for [department] in Result._read_group(
+                [('plan_id', '=', plan.id)], ['department_id'])},
+            'job': {job.id: job.display_name for [job] in Result._read_group(
+                [('plan_id', '=', plan.id)], ['job_id'])},
+            'state': dict(Result._fields['state']._description_selection(request.env)),
+        }
+
+        def rows():
+            for batch in self._fetch(request.env.registry, query, [plan.id]):
+                yield [
+                    (name, labels['department'].get(department_id, ''), labels['job'].get(job_id, ''),
+                     other, labels['state'].get(state, state), *answer)
+                    for name, department_id, job_id, other, state, *answer in batch
+                ]
+
+        if file_format == 'csv':
+            body = self._csv_chunks(columns, rows())
+            mimetype = 'text/csv;charset=utf-8'
+        else:
+            body = self._xlsx_chunks(columns, rows())
+            mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        filename = f"{plan.name}.{file_format}"
+        return request.make_response(body, headers=[
+            ('Content-Type', mimetype),
+            ('Content-Disposition', content_disposition(filename)),
+        ])
+
+    def _fetch(self, registry, query, params):
+        """ Yield the rows of ``query`` by batches of ``FETCH_SIZE`` from a
+        server-side cursor opened in a new database cursor. """
+        with registry.cursor() as cr:
+            cr.execute(f"DECLARE hr_appraisal_export NO SCROLL CURSOR FOR {query}", params)
+            while True:
+                cr.execute("FETCH %s FROM hr_appraisal_export", [FETCH_SIZE])
+                batch = cr.fetchall()
+                if not batch:
+                    break
+                yield batch
+            cr.execute("CLOSE hr_appraisal_export")
+
+    def _csv_chunks(self, columns, batches):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue().encode('utf-8')
+        for batch in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(batch)
+            yield buffer.getvalue().encode('utf-8')
+
+    def _xlsx_chunks(self, columns, batches):
+        """ Build the workbook in ``constant_memory`` mode, which flushes each
+        row to a temporary file once written, then stream the file. A new
+        worksheet is started whenever one is full. """
+        with tempfile.TemporaryFile() as output:
+            workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+            header_style = workbook.add_format({'bold': True})
+            worksheet, row_index = None, XLSX_MAX_ROWS
+            for batch in batches:
+                for row in batch:
+                    if row_index >= XLSX_MAX_ROWS:
+                        worksheet = workbook.add_worksheet()
+                        worksheet.write_row(0, 0, columns, header_style)
+                        row_index = 0
+                    row_index += 1
+                    worksheet.write_row(row_index, 0, row)
+            if worksheet is None:
+                workbook.add_worksheet().write_row(0, 0, columns, header_style)
+            workbook.close()
+
+            output.seek(0)
+            while chunk := output.read(CHUNK_SIZE):
+                yield chunk
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+""" Remove the duplicates that the unique constraints of this version would
+reject; Odoo only logs a warning when it cannot add a constraint, which
+would leave the ON CONFLICT inserts of the generation without their index. """
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    _merge_threesixty_allocations(cr)
+    _dedupe_appraisal_allocations(cr)
+    _merge_review_lists(cr)
+    _dedupe_reviews(cr)
+    _dedupe_appraisals(cr)
+
+
+def _merge_threesixty_allocations(cr):
+    """ Merge the allocations of a reviewer to the same 360 plan into their
+    oldest allocation, moving their review lines and reviews over. """
+    cr.execute("""
+        CREATE TEMPORARY TABLE hr_appraisal_merged_threesixty_allocation ON COMMIT DROP AS
+        SELECT id, MIN(id) OVER (PARTITION BY plan_id, reviewer_id) AS keep_id
+          FROM hr_threesixty_plan_allocation
+         WHERE plan_id IS NOT NULL
+    """)
+    cr.execute("DELETE FROM hr_appraisal_merged_threesixty_allocation WHERE id = keep_id")
+    for table in ('hr_threesixty_review_list', 'hr_threesixty_review'):
+        cr.execute(f"""
+            UPDATE {table} record
+               SET allocation_id = merged.keep_id
+              FROM hr_appraisal_merged_threesixty_allocation merged
+             WHERE record.allocation_id = merged.id
+        """)
+    cr.execute("""
+        DELETE FROM hr_threesixty_plan_allocation allocation
+         USING hr_appraisal_merged_threesixty_allocation merged
+         WHERE allocation.id = merged.id
+    """)
+    if cr.rowcount:
+        _logger.info("Merged %s duplicate 360 plan allocation(s)", cr.rowcount)
+
+
+def _dedupe_appraisal_allocations(cr):
+    """ Keep the oldest allocation of an employee to an appraisal plan, as
+    allocated if any of its duplicates was. """
+    cr.execute("""
+        CREATE TEMPORARY TABLE hr_appraisal_merged_allocation ON COMMIT DROP AS
+        SELECT id, MIN(id) OVER (PARTITION BY plan_id, employee_id) AS keep_id,
+               BOOL_OR(state = 'allocated') OVER (PARTITION BY plan_id, employee_id) AS allocated
+          FROM hr_appraisal_plan_allocation
+         WHERE plan_id IS NOT NULL
+    """)
+    cr.execute("""
+        UPDATE hr_appraisal_plan_allocation allocation
+           SET state = 'allocated'
+          FROM hr_appraisal_merged_allocation merged
+         WHERE allocation.id = merged.keep_id AND merged.allocated
+           AND allocation.state IS DISTINCT FROM 'allocated'
+    """)
+    cr.execute("DELETE FROM hr_appraisal_merged_allocation WHERE id = keep_id")
+    cr.execute("""
+        DELETE FROM hr_appraisal_plan_allocation allocation
+         USING hr_appraisal_merged_allocation merged
+         WHERE allocation.id = merged.id
+    """)
+    if cr.rowcount:
+        _logger.info("Deleted %s duplicate appraisal plan allocation(s)", cr.rowcount)
+
+
+def _merge_review_lists(cr):
+    """ Merge the review lines of a reviewer for the same reviewed employee
+    into their oldest line, moving their reviews over. """
+    cr.execute("""
+        CREATE TEMPORARY TABLE hr_appraisal_merged_review_list ON COMMIT DROP AS
+        SELECT id, MIN(id) OVER (PARTITION BY allocation_id, reviewed_id) AS keep_id
+          FROM hr_threesixty_review_list
+         WHERE allocation_id IS NOT NULL AND reviewed_id IS NOT NULL
+    """)
+    cr.execute("DELETE FROM hr_appraisal_merged_review_list WHERE id = keep_id")
+    cr.execute("""
+        UPDATE hr_threesixty_review review
+           SET review_list_id = merged.keep_id
+          FROM hr_appraisal_merged_review_list merged
+         WHERE review.review_list_id = merged.id
+    """)
+    cr.execute("""
+        UPDATE hr_threesixty_review_list line
+           SET state = 'active'
+          FROM hr_appraisal_merged_review_list merged
+         WHERE line.id = merged.keep_id AND line.state = 'new'
+    """)
+    cr.execute("""
+        DELETE FROM hr_threesixty_review_list line
+         USING hr_appraisal_merged_review_list merged
+         WHERE line.id = merged.id
+    """)
+    if cr.rowcount:
+        _logger.info("Merged %s duplicate 360 review line(s)", cr.rowcount)
+
+
+def _dedupe_reviews(cr):
+    """ Keep one review per review line, the most advanced one. The other
+    reviews are deleted when nobody has answered them yet, otherwise they
+    are detached from the line so no answer is lost. """
+    cr.execute("""
+        CREATE TEMPORARY TABLE hr_appraisal_duplicate_review ON COMMIT DROP AS
+        SELECT id
+          FROM (SELECT id, ROW_NUMBER() OVER (
+                           PARTITION BY review_list_id
+                           ORDER BY state = 'done' DESC NULLS LAST, id
+                       ) AS rank
+                  FROM hr_threesixty_review
+                 WHERE review_list_id IS NOT NULL) ranked
+         WHERE rank > 1
+    """)
+    cr.execute("""
+        DELETE FROM hr_appraisal_duplicate_review duplicate
+         USING hr_threesixty_review review
+         WHERE review.id = duplicate.id
+           AND review.state = 'draft'
+           AND NOT EXISTS (
+                   SELECT 1 FROM hr_threesixty_review_question question
+                    WHERE question.review_id = review.id
+                      AND (question.reviewer_value != 0 OR question.reviewer_comment IS NOT NULL))
+     RETURNING duplicate.id
+    """)
+    unanswered = [id_ for id_, in cr.fetchall()]
+    if unanswered:
+        cr.execute("DELETE FROM hr_threesixty_review_question WHERE review_id IN %s", [tuple(unanswered)])
+        cr.execute("DELETE FROM hr_threesixty_review WHERE id IN %s", [tuple(unanswered)])
+        _logger.info("Deleted %s unanswered duplicate 360 review(s)", len(unanswered))
+    cr.execute("""
+        UPDATE hr_threesixty_review review
+           SET review_list_id = NULL
+          FROM hr_appraisal_duplicate_review duplicate
+         WHERE review.id = duplicate.id
+     RETURNING review.id
+    """)
+    detached = [id_ for id_, in cr.fetchall()]
+    if detached:
+        _logger.warning("Detached %s answered duplicate 360 review(s) from their review line: %s", len(detached), detached)
+
+
+def _dedupe_appraisals(cr):
+    """ Keep one appraisal per employee and plan, the most advanced one. The
+    other appraisals are deleted when they are untouched drafts, otherwise
+    they are detached from the plan so no answer is lost. """
+    cr.execute("""
+        CREATE TEMPORARY TABLE hr_appraisal_duplicate_appraisal ON COMMIT DROP AS
+        SELECT id
+          FROM (SELECT id, ROW_NUMBER() OVER (
+                           PARTITION BY plan_id, employee_id
+                           ORDER BY ARRAY_POSITION(ARRAY['done', 'manager_review', 'submitted', 'draft'], state::text) NULLS LAST, id
+                       ) AS rank
+                  FROM hr_appraisal
+                 WHERE plan_id IS NOT NULL) ranked
+         WHERE rank > 1
+    """)
+    cr.execute("""
+        DELETE FROM hr_appraisal_duplicate_appraisal duplicate
+         USING hr_appraisal appraisal
+         WHERE appraisal.id = duplicate.id
+           AND appraisal.state = 'draft'
+           AND NOT EXISTS (
+                   SELECT 1 FROM hr_appraisal_question question
+                    WHERE question.appraisal_id = appraisal.id
+                      AND (question.employee_value != 0 OR question.manager_value != 0
+                           OR question.employee_comment IS NOT NULL OR question.manager_comment IS NOT NULL))
+     RETURNING duplicate.id
+    """)
+    untouched = [id_ for id_, in cr.fetchall()]
+    if untouched:
+        cr.execute("DELETE FROM hr_appraisal_question WHERE appraisal_id IN %s", [tuple(untouched)])
+        cr.execute("DELETE FROM hr_appraisal WHERE id IN %s", [tuple(untouched)])
+        _logger.info("Deleted %s untouched duplicate appraisal(s)", len(untouched))
+    cr.execute("""
+        UPDATE hr_appraisal appraisal
+           SET plan_id = NULL
+          FROM hr_appraisal_duplicate_appraisal duplicate
+         WHERE appraisal.id = duplicate.id
+     RETURNING appraisal.id
+    """)
+    detached = [id_ for id_, in cr.fetchall()]
+    if detached:
+        _logger.warning("Detached %s answered duplicate appraisal(s) from their plan: %s", len(detached), detached)
+
@@ -1,13 +1,19 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+from . import hr_appraisal_question_template
 from . import hr_appraisal
 from . import hr_appraisal_score
 from . import hr_appraisal_plan
 from . import hr_appraisal_category
 from . import hr_threesixty_plan
 from . import hr_threesixty
+from . import hr_threesixty_feedback
 from . import add_employees
+from . import appraisal_import
+from . import hr_appraisal_notification
+from . import hr_appraisal_reminder
+from . import hr_appraisal_analysis
 #from . import hr_appraisal_plan_question
 
 
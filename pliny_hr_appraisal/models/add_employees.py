@@ -1,42 +1,73 @@
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
+from odoo.osv import expression
+
+from ..tools.concurrency import insert_missing
+
+
+class HrPlanEmployeeSelectionMixin(models.AbstractModel):
+    _name = 'hr.plan.employee.selection.mixin'
+    _description = 'Employee selection of the Add Employees wizards'
+
+    employee_ids = fields.Many2many('hr.employee', string='Employees')
+    department_ids = fields.Many2many('hr.department', string='Departments')
+    job_ids = fields.Many2many('hr.job', string='Job Positions')
+    company_ids = fields.Many2many('res.company', string='Companies')
+
+    def _get_selected_employee_ids(self):
+        """ Return the ids of the picked employees plus those of every employee
+        in any of the selected departments, jobs or companies; the latter are
+        resolved on the server in one query. """
+        self.ensure_one()
+        employee_ids = list(self.employee_ids.ids)
+        domains = []
+        if self.department_ids:
+            domains.append([('department_id', 'in', self.department_ids.ids)])
+        if self.job_ids:
+            domains.append([('job_id', 'in', self.job_ids.ids)])
+        if self.company_ids:
+            domains.append([('company_id', 'in', self.company_ids.ids)])
+        if domains:
+            employee_ids += self.env['hr.employee'].search(expression.OR(domains), order='id').ids
+        return list(dict.fromkeys(employee_ids))
+
 
 class HrThreesixtyAddEmployeesWizard(models.TransientModel):
     _name = 'hr.threesixty.add.employees.wizard'
+    _inherit = 'hr.plan.employee.selection.mixin'
     _description = 'Add Employees to 360 Plan'
 
-    employee_ids = fields.Many2many('hr.employee', string='Employees')
-
     plan_id = fields.Many2one('hr.threesixty.plan', string='Plan', required=True)
 
     def action_add_employees(self):
-        for employee in self.employee_ids:
-            exists = self.env['hr.threesixty.plan.allocation'].search([
-                ('plan_id', '=', self.plan_id.id),
-                ('reviewer_id', '=', employee.id)
-            ], limit=1)
-            if not exists:
-                self.env['hr.threesixty.plan.allocation'].create({
-                    'plan_id': self.plan_id.id,
-                    'reviewer_id': employee.id
-                })
+        Allocation = self.env['hr.threesixty.plan.allocation']
+        for wizard in self:
+            # Skip the reviewers already allocated, including by a concurrent
+            # wizard, instead of failing on the unique constraint
+            employees = self.env['hr.employee'].browse(wizard._get_selected_employee_ids())
+            insert_missing(Allocation, [
+                {
+                    'plan_id': wizard.plan_id.id,
+                    'reviewer_id': employee.id,
+                    'reviewer_user_id': employee.user_id.id,
+                }
+                for employee in employees
+            ], ['plan_id', 'reviewer_id'])
+
 
 class HrAppraisalAddEmployeesWizard(models.TransientModel):
     _name = 'hr.appraisal.add.employees.wizard'
+    _inherit = 'hr.plan.employee.selection.mixin'
     _description = 'Add Employees to Appraisal Plan'
 
-    employee_ids = fields.Many2many('hr.employee', string='Employees')
-
     plan_id = fields.Many2one('hr.appraisal.plan', string='Plan', required=True)
 
     def action_add_appraisal_employees(self):
-        for employee in self.employee_ids:
-            exists = self.env['hr.appraisal.plan.allocation'].search([
-                ('plan_id', '=', self.plan_id.id),
-                ('employee_id', '=', employee.id)
-            ], limit=1)
-            if not exists:
-                self.env['hr.appraisal.plan.allocation'].create({
-                    'plan_id': self.plan_id.id,
-                    'employee_id': employee.id
-                })
+        Allocation = self.env['hr.appraisal.plan.allocation']
+        for wizard in self:
+            # Skip the employees already allocated, including by a concurrent
+            # wizard, instead of failing on the unique constraint
+            insert_missing(Allocation, [
+                {'plan_id': wizard.plan_id.id, 'employee_id': employee_id}
+                for employee_id in wizard._get_selected_employee_ids()
+            ], ['plan_id', 'employee_id'])
@@ -0,0 +1,247 @@
+import base64
+import csv
+import io
+import json
+
+from odoo import models, fields, api, Command, _
+from odoo.exceptions import UserError
+from odoo.tools import split_every
+
+# Appraisals created per ORM call, and question rows per INSERT statement
+IMPORT_BATCH_SIZE = 1000
+# Errors listed in the report, the others are only counted
+REPORT_MAX_ERRORS = 200
+# Appraisal level columns, read on the first row of each appraisal
+DATE_COLUMNS = ['start_date', 'end_date', 'deadline', 'employee_submit_date', 'manager_submit_date']
+
+
+class AppraisalImportWizard(models.TransientModel):
+    _name = 'hr.appraisal.import.wizard'
+    _description = 'Import Historical Appraisals'
+
+    data_file = fields.Binary(string='File', required=True,
+        help="CSV or JSON file with one row per answer and the columns: employee (name or work email), "
+             "plan, category, state, question, description, maximum_value, employee_value, manager_value, "
+             "employee_comment, manager_comment, " + ", ".join(DATE_COLUMNS) + ".")
+    filename = fields.Char()
+    report = fields.Text(readonly=True)
+
+    def action_validate(self):
+        """ Dry run: check the whole file and report, without importing. """
+        self.ensure_one()
+        appraisals, errors = self._parse_rows(self._read_rows())
+        self.report = self._format_report(appraisals, errors)
+        return self._reopen()
+
+    def action_import(self):
+        self.ensure_one()
+        appraisals, errors = self._parse_rows(self._read_rows())
+        if errors:
+            self.report = self._format_report(appraisals, errors)
+            return self._reopen()
+        records = self._import(appraisals)
+        self.report = _("%(appraisals)s appraisal(s) and %(answers)s score(s) imported.",
+                        appraisals=len(records),
+                        answers=sum(len(appraisal['answers']) for appraisal in appraisals.values()))
+        return self._reopen()
+
+    def _reopen(self):
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def _read_rows(self):
+        content = base64.b64decode(self.data_file or b'')
+        try:
+            if (self.filename or '').lower().endswith('.json'):
+                rows = json.loads(content)
+                if not isinstance(rows, list):
+                    raise ValueError(_("The JSON file must contain a list of rows."))
+                return rows
+            return list(csv.DictReader(io.StringIO(content.decode('utf-8-sig'))))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise UserError(_("The file could not be read: %s", e))
+
+    @api.model
+    def _parse_rows(self, rows):
+        """ Resolve and validate ``rows`` against lookup maps loaded once.
+
+        :return: the appraisals to create, as ``{(employee_id, plan_id):
+                 {'vals': create values, 'answers': [(question key, employee
+                 value, manager value, employee comment, manager comment)]}}``,
+                 and the list of ``(line number, message)`` errors
+        """
+        employees = {}
+        for employee in self.env['hr.employee'].with_context(active_test=False).search_fetch(
+                [], ['name', 'work_email', 'parent_id', 'department_id', 'job_id', 'company_id']):
+            for key in {(employee.name or '').lower(), (employee.work_email or '').lower()} - {''}:
+                # Homonyms can only be told apart by their work email
+                employees[key] = None if key in employees else employee
+        plans = {plan.name: plan for plan in self.env['hr.appraisal.plan'].search_fetch([], ['name', 'score_id'])}
+        categories = {category.name: category.id for category in self.env['hr.appraisal.category'].search_fetch([], ['name'])}
+        states = {}
+        for key, label in self.env['hr.appraisal']._fields['state']._description_selection(self.env):
+            states[key] = states[label.lower()] = key
+        existing = {
+            (appraisal.employee_id.id, appraisal.plan_id.id)
+            for appraisal in self.env['hr.appraisal'].search_fetch(
+                [('plan_id', 'in', [plan.id for plan in plans.values()])], ['employee_id', 'plan_id'])
+        }
+
+        appraisals = {}
+        errors = []
+        for line_number, row in enumerate(rows, start=2):
+            cell = lambda column: str(row.get(column) or '').strip()
+            employee = employees.get(cell('employee').lower(), False)
+            plan = plans.get(cell('plan'))
+            category_id = categories.get(cell('category'), False)
+            state = states.get(cell('state').lower() or 'done')
+            if employee is None:
+                errors.append((line_number, _("Several employees are named %s, use their work email.", cell('employee'))))
+                continue
+            if not employee:
+                errors.append((line_number, _("Unknown employee %s.", cell('employee'))))
+                continue
+            if not plan:
+                errors.append((line_number, _("Unknown appraisal plan %s.", cell('plan'))))
+                continue
+            if cell('category') and not category_id:
+                errors.append((line_number, _("Unknown category %s.", cell('category'))))
+                continue
+            if not state:
+                errors.append((line_number, _("Unknown status %s.", cell('state'))))
+                continue
+            if not cell('question'):
+                errors.append((line_number, _("The question is missing.")))
+                continue
+            if (employee.id, plan.id) in existing:
+                errors.append((line_number, _("%(employee)s already has an appraisal for %(plan)s.",
+                                              employee=employee.name, plan=plan.name)))
+                continue
+            try:
+                maximum = int(cell('maximum_value') or plan.score_id.maximum_value or 0)
+                employee_value = int(cell('employee_value') or 0)
+                manager_value = int(cell('manager_value') or 0)
+                dates = {column: fields.Date.to_date(cell(column) or None) for column in DATE_COLUMNS}
+            except ValueError as e:
+                errors.append((line_number, _("Invalid number or date: %s", e)))
+                continue
+            if not (0 <= employee_value <= maximum and 0 <= manager_value <= maximum):
+                errors.append((line_number, _("The scores must be between 0 and %s.", maximum)))
+                continue
+
+            appraisal = appraisals.setdefault((employee.id, plan.id), {
+                'vals': {
+                    'employee_id': employee.id,
+                    'manager_id': employee.parent_id.id,
+                    'department_id': employee.department_id.id,
+                    'job_id': employee.job_id.id,
+                    'company_id': employee.company_id.id,
+                    'plan_id': plan.id,
+                    'category_id': category_id,
+                    'state': state,
+                    **dates,
+                },
+                'answers': [],
+            })
+            appraisal['answers'].append((
+                (cell('question'), cell('description') or False, maximum),
+                employee_value,
+                manager_value,
+                cell('employee_comment') or None,
+                cell('manager_comment') or None,
+            ))
+        return appraisals, errors
+
+    @api.model
+    def _format_report(self, appraisals, errors):
+        report = [_("%(appraisals)s appraisal(s) and %(answers)s score(s) ready to be imported.",
+                    appraisals=len(appraisals),
+                    answers=sum(len(appraisal['answers']) for appraisal in appraisals.values()))]
+        if errors:
+            report.append(_("%s line(s) with errors:", len(errors)))
+            report += [_("Line %(line)s: %(message)s", line=line, message=message)
+                       for line, message in errors[:REPORT_MAX_ERRORS]]
+        return "\n".join(report)
+
+    @api.model
+    def _import(self, appraisals):
+        """ Create the appraisals with the ORM in batches, insert their
+        questions in bulk in SQL, then compute the scores once at the end.
+
+        The questions are linked to the template lines of their plan matching
+        their text and maximum; the missing ones are frozen into a new template
+        version of the plan.
+        """
+        lines = self._get_template_lines(appraisals)
+        Appraisal = self.env['hr.appraisal'].with_context(tracking_disable=True)
+        cr = self.env.cr
+        records = Appraisal
+        for batch in split_every(IMPORT_BATCH_SIZE, list(appraisals.values())):
+            batch_records = Appraisal.create([appraisal['vals'] for appraisal in batch])
+            rows = [
+                (record.id, lines[record.plan_id.id][key], employee_value, manager_value,
+                 employee_comment, manager_comment, record.state,
+                 self.env.uid, cr.now(), self.env.uid, cr.now())
+                for record, appraisal in zip(batch_records, batch)
+                for key, employee_value, manager_value, employee_comment, manager_comment in appraisal['answers']
+            ]
+            for page in split_every(IMPORT_BATCH_SIZE, rows):
+                # Each row tuple is adapted to a parenthesised list of values
+                cr.execute(f"""
+                    INSERT INTO hr_appraisal_question (
+                        appraisal_id, template_line_id, employee_value, manager_value,
+                        employee_comment, manager_comment, appraisal_state,
+                        create_uid, create_date, write_uid, write_date
+                    ) VALUES {", ".join(["%s"] * len(page))}
+                """, page)
+            records |= batch_records
+
+        # The questions were inserted behind the ORM's back
+        self.env['hr.appraisal.question'].invalidate_model()
+        records.invalidate_recordset(['question_ids'])
+        score_fields = ['total_employee_score', 'employee_score_percentage', 'total_manager_score', 'manager_score_percentage']
+        for fname in score_fields:
+            self.env.add_to_compute(Appraisal._fields[fname], records)
+        Appraisal.flush_model(score_fields)
+        return records
+
+    @api.model
+    def _get_template_lines(self, appraisals):
+        """ Return ``{plan_id: {(name, description, maximum): template line id}}``
+        for the questions of ``appraisals``. """
+        Template = self.env['hr.appraisal.question.template']
+        questions_by_plan = {}
+        for (_employee_id, plan_id), appraisal in appraisals.items():
+            questions = questions_by_plan.setdefault(plan_id, {})
+            for answer in appraisal['answers']:
+                questions[answer[0]] = True
+
+        lines = {}
+        for plan_id, questions in questions_by_plan.items():
+            plan_lines = {
+                (line.name, line.description or False, line.maximum_value): line.id
+                for line in self.env['hr.appraisal.question.template.line'].search_fetch(
+                    [('template_id.appraisal_plan_id', '=', plan_id)], ['name', 'description', 'maximum_value'])
+            }
+            missing = [question for question in questions if question not in plan_lines]
+            if missing:
+                latest = Template.search([('appraisal_plan_id', '=', plan_id)], limit=1)
+                template = Template.create({
+                    'appraisal_plan_id': plan_id,
+                    'version': latest.version + 1,
+                    'line_ids': [
+                        Command.create({'sequence': sequence, 'name': name, 'description': description, 'maximum_value': maximum_value})
+                        for sequence, (name, description, maximum_value) in enumerate(missing)
+                    ],
+                })
+                plan_lines.update({
+                    (line.name, line.description or False, line.maximum_value): line.id
+                    for line in template.line_ids
+                })
+            lines[plan_id] = plan_lines
+        return lines
@@ -1,15 +1,21 @@
-from odoo import models, fields, api, _
-from odoo.exceptions import ValidationError
+from odoo import models, fields, api, tools, _
+from odoo.exceptions import UserError, ValidationError
+
+from ..tools.concurrency import insert_missing
 
 class Appraisal(models.Model):
     _name = "hr.appraisal"
     _description = "Employee Appraisal"
 
-    employee_id = fields.Many2one('hr.employee', string="Employee", required=True)
-    manager_id = fields.Many2one('hr.employee', string="Manager")
+    employee_id = fields.Many2one('hr.employee', string="Employee", required=True, index=True)
+    manager_id = fields.Many2one('hr.employee', string="Manager", index=True)
     department_id = fields.Many2one('hr.department', string="Department")
     job_id = fields.Many2one('hr.job', string="Job Title")
     plan_id = fields.Many2one('hr.appraisal.plan', string="Appraisal Plan")
+    # Denormalised for the record rules and "My" menus, which would otherwise
+    # join hr_employee on every read
+    employee_user_id = fields.Many2one(related='employee_id.user_id', string="Employee User", store=True, index=True, precompute=True)
+    manager_user_id = fields.Many2one(related='manager_id.user_id', string="Manager User", store=True, index=True, precompute=True)
     category_id = fields.Many2one('hr.appraisal.category', string="Category")
     start_date = fields.Date()
     end_date = fields.Date()
@@ -35,6 +41,60 @@ class Appraisal(models.Model):
         ('done', 'Completed'),
         ('cancelled', 'Cancelled')
     ], string="Status", default='draft', tracking=True)
+    # Last deadline reminder sent, see hr.appraisal.reminder
+    reminded_state = fields.Selection([
+        ('draft', 'Draft'),
+        ('submitted', 'Submitted'),
+    ], string="Reminded Status", readonly=True, copy=False)
+    reminded_deadline = fields.Date(string="Reminded Deadline", readonly=True, copy=False)
+
+    _sql_constraints = [
+        ('plan_employee_uniq', 'unique(plan_id, employee_id)', 'This employee already has an appraisal for this plan.'),
+    ]
+
+    def init(self):
+        # Superseded by the index of the plan_employee_uniq constraint, once
+        # it could be created
+        if tools.sql.constraint_definition(self.env.cr, self._table, 'hr_appraisal_plan_employee_uniq'):
+            self.env.cr.execute("DROP INDEX IF EXISTS hr_appraisal_plan_employee_index")
+        else:
+            tools.create_index(self.env.cr, 'hr_appraisal_plan_employee_index', self._table, ['plan_id', 'employee_id'])
+        # The plan counters and bulk transitions filter a plan on its states
+        tools.create_index(self.env.cr, 'hr_appraisal_plan_state_index', self._table, ['plan_id', 'state'])
+        # The deadline reminders only look at the open appraisals
+        tools.create_index(self.env.cr, 'hr_appraisal_open_deadline_index', self._table,
+                           ['deadline'], where="state IN ('draft', 'submitted')")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        appraisals = super().create(vals_list)
+        Plan = self.env['hr.appraisal.plan']
+        Plan._apply_appraisal_counters(Plan._get_appraisal_counters(appraisals))
+        return appraisals
+
+    @api.model
+    def _create_missing(self, vals_list):
+        """ Create the appraisals of ``vals_list`` whose employee has none for
+        their plan yet, in bulk, skipping those created meanwhile by another
+        transaction instead of failing on the unique constraint.
+
+        :return: the created appraisals
+        """
+        appraisals = insert_missing(self, vals_list, ['plan_id', 'employee_id'])
+        Plan = self.env['hr.appraisal.plan']
+        Plan._apply_appraisal_counters(Plan._get_appraisal_counters(appraisals))
+        return appraisals
+
+    def write(self, vals):
+        if not {'plan_id', 'state', 'deadline'}.intersection(vals):
+            return super().write(vals)
+        Plan = self.env['hr.appraisal.plan']
+        before = Plan._get_appraisal_counters(self)
+        res = super().write(vals)
+        deltas = Plan._get_appraisal_counters(self)
+        deltas.subtract(before)
+        Plan._apply_appraisal_counters(deltas)
+        return res
 
     @api.onchange('employee_id')
     def _onchange_employee_id(self):
@@ -53,48 +113,109 @@ class Appraisal(models.Model):
             self.company_id = self.employee_id.company_id
 
     def action_draft(self):
-        for record in self:
-            record.state = "draft"
+        self.write({'state': 'draft'})
         return True
 
     def action_submit(self):
-        for record in self:
-            record.state = "submitted"
+        self._check_transition(['draft'], _("Only draft appraisals can be submitted."))
+        self.write({
+            'state': 'submitted',
+            'employee_submit_date': fields.Date.today(),
+        })
         return True
 
-    def action_submit(self):
-        self.state = 'submitted'
-        self.employee_submit_date = fields.Date.today()
-
     def action_manager_review(self):
-        self.state = 'manager_review'
-        self.manager_submit_date = fields.Date.today()
+        self._check_transition(['submitted'], _("Only submitted appraisals can be reviewed by the manager."))
+        self.write({
+            'state': 'manager_review',
+            'manager_submit_date': fields.Date.today(),
+        })
+        return True
 
     def action_complete(self):
-        self.state = 'done'
+        self._check_transition(['manager_review'], _("Only appraisals reviewed by the manager can be completed."))
+        self.write({'state': 'done'})
+        return True
 
-    @api.depends('question_ids.employee_value', 'question_ids.maximum_value')
+    def _check_transition(self, from_states, message):
+        """ Raise ``message`` unless every appraisal of ``self`` is in one of
+        ``from_states``, checked in one query whatever the selection size. """
+        if self.search_count([('id', 'in', self.ids), ('state', 'not in', from_states)], limit=1):
+            raise UserError(message)
+
+    @api.depends('question_ids.employee_value', 'question_ids.template_line_id')
     def _compute_employee_score(self):
+        totals = self._get_score_totals('manager')
         for record in self:
-            total_score = sum(q.employee_value for q in record.question_ids)
-            max_score = sum(q.maximum_value for q in record.question_ids)
-            record.total_employee_score = total_score
-            record.employee_score_percentage = (total_score / max_score * 100) if max_score > 0 else 0.0
+            employee_score, _manager_score, max_score = totals.get(record.id, (0, 0, 0))
+            record.total_employee_score = employee_score
+            record.employee_score_percentage = (employee_score / max_score * 100) if max_score > 0 else 0.0
 
-    @api.depends('question_ids.employee_value', 'question_ids.maximum_value')
+    @api.depends('question_ids.manager_value', 'question_ids.template_line_id')
     def _compute_manager_score(self):
+        totals = self._get_score_totals('employee')
+        for record in self:
+            _employee_score, manager_score, max_score = totals.get(record.id, (0, 0, 0))
+            record.total_manager_score = manager_score
+            record.manager_score_percentage = (manager_score / max_score * 100) if max_score > 0 else 0.0
+
+    def _get_score_totals(self, other):
+        """ Return ``{appraisal_id: (employee total, manager total, maximum total)}``.
+
+        Saved appraisals are aggregated with one grouped query joining their
+        questions to the template lines, a question without a line counting
+        towards the scores with no maximum; new records (e.g. in onchange) are
+        summed from the cache since their questions are not in the database.
+
+        The totals of the appraisals whose ``other`` (``'employee'`` or
+        ``'manager'``) score is also pending recomputation are kept until that
+        compute reads them, so a batch is aggregated by one query even when
+        both scores change. They are discarded when a question changes.
+
+        :param other: the score computed by the other compute
+        """
+        cache = self.env.cr.precommit.data.setdefault('hr.appraisal.score_totals', {})
+        totals = {}
         for record in self:
-            total_score = sum(q.manager_value for q in record.question_ids)
-            max_score = sum(q.maximum_value for q in record.question_ids)
-            record.total_manager_score = total_score
-            record.manager_score_percentage = (total_score / max_score * 100) if max_score > 0 else 0.0
+            if record.id in cache:
+                totals[record.id] = cache.pop(record.id)
+        stored = self.filtered(lambda record: record.id and record.id not in totals)
+        if stored:
+            self.env['hr.appraisal.question'].flush_model(['appraisal_id', 'template_line_id', 'employee_value', 'manager_value'])
+            self.env.cr.execute("""
+                SELECT question.appraisal_id,
+                       SUM(question.employee_value),
+                       SUM(question.manager_value),
+                       COALESCE(SUM(line.maximum_value), 0)
+                  FROM hr_appraisal_question question
+             LEFT JOIN hr_appraisal_question_template_line line ON line.id = question.template_line_id
+                 WHERE question.appraisal_id IN %s
+              GROUP BY question.appraisal_id
+            """, [tuple(stored.ids)])
+            fetched = {appraisal_id: tuple(sums) for appraisal_id, *sums in self.env.cr.fetchall()}
+            totals.update(fetched)
+            other_field = self._fields[f'total_{other}_score']
+            pending = stored & self.env.records_to_compute(other_field)
+            cache.update((record.id, fetched.get(record.id, (0, 0, 0))) for record in pending)
+        for record in self.filtered(lambda record: not record.id):
+            questions = record.question_ids
+            totals[record.id] = (
+                sum(questions.mapped('employee_value')),
+                sum(questions.mapped('manager_value')),
+                sum(questions.mapped('maximum_value')),
+            )
+        return totals
 
     #Prevent deletion of records that have been allocated
     def unlink(self):
             for record in self:
                 if record.state == 'done':
                     raise UserError("You cannot delete a record that is already done.")
-            return super().unlink()
+            Plan = self.env['hr.appraisal.plan']
+            deltas = Plan._get_appraisal_counters(self)
+            res = super().unlink()
+            Plan._apply_appraisal_counters({key: -count for key, count in deltas.items()})
+            return res
 
 
 
@@ -102,10 +223,11 @@ class AppraisalQuestion(models.Model):
     _name = "hr.appraisal.question"
     _description = "This is the appraisal for an employee"
 
-    appraisal_id = fields.Many2one('hr.appraisal', string="Appraisal")
-    name = fields.Char(string="Question Title", required=True)
-    description = fields.Char(string="Description")
-    maximum_value = fields.Integer(string="Maximum Value")
+    appraisal_id = fields.Many2one('hr.appraisal', string="Appraisal", index=True)
+    template_line_id = fields.Many2one('hr.appraisal.question.template.line', string="Template Question", ondelete='restrict', index=True)
+    name = fields.Char(related='template_line_id.name', string="Question Title")
+    description = fields.Char(related='template_line_id.description', string="Description")
+    maximum_value = fields.Integer(related='template_line_id.maximum_value', string="Maximum Value")
     employee_value = fields.Integer(string="Employee Score", default=0)
     employee_comment = fields.Char(string="Employee Comments")
     manager_value = fields.Integer(string="Manager Score", default=0)
@@ -119,9 +241,34 @@ class AppraisalQuestion(models.Model):
     )
 
     _sql_constraints = [
-        ('manager_value', 'CHECK(manager_value >= 0 and maximum_value >= manager_value )','The manager value  cant be greater than the maximum and not lower than the minimum.'),
+        ('manager_value', 'CHECK(manager_value >= 0)','The manager value must be a positive value or 0.'),
         ('employee_value', 'CHECK(employee_value >= 0)','The employee value must be a positive value or 0.'),
-        ('employee_value', 'CHECK(maximum_value >= employee_value)', 'The employee score cant exceed the maximum.')
     ]
 
+    def init(self):
+        self.env['hr.appraisal.question.template']._freeze_legacy_questions(
+            self._table, 'appraisal_plan_id',
+            "(SELECT a.plan_id FROM hr_appraisal a WHERE a.id = q.appraisal_id)",
+        )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env.cr.precommit.data.pop('hr.appraisal.score_totals', None)
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if {'appraisal_id', 'template_line_id', 'employee_value', 'manager_value'}.intersection(vals):
+            self.env.cr.precommit.data.pop('hr.appraisal.score_totals', None)
+        return super().write(vals)
+
+    def unlink(self):
+        self.env.cr.precommit.data.pop('hr.appraisal.score_totals', None)
+        return super().unlink()
 
+    @api.constrains('employee_value', 'manager_value', 'template_line_id')
+    def _check_maximum_value(self):
+        for question in self:
+            if question.employee_value > question.maximum_value:
+                raise ValidationError("The employee score cant exceed the maximum.")
+            if question.manager_value > question.maximum_value:
+                raise ValidationError("The manager value  cant be greater than the maximum.")
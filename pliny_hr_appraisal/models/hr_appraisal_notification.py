@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta
+import logging
+
+from odoo import models, fields, api
+
+from ..tools.profiling import PhaseTimer
+
+_logger = logging.getLogger(__name__)
+
+# Scheduled date of the queued emails, which keeps them out of the standard
+# mail queue until the dispatcher sends them
+HELD_MAIL_DATE = datetime(9999, 12, 31)
+
+
+class AppraisalNotification(models.Model):
+    _name = "hr.appraisal.notification"
+    _description = "Outbox of the appraisal emails and in-app notifications"
+    _order = "id"
+
+    notification_type = fields.Selection([
+        ('mail', 'Email'),
+        ('bus', 'In-app'),
+    ], string="Type", required=True)
+    appraisal_id = fields.Many2one('hr.appraisal', string="Appraisal", ondelete='cascade')
+    template_id = fields.Many2one('mail.template', string="Email Template", ondelete='cascade')
+    mail_id = fields.Many2one('mail.mail', string="Email", ondelete='set null')
+    partner_id = fields.Many2one('res.partner', string="Recipient")
+    payload = fields.Json(string="Payload")
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ], string="Status", default='pending', required=True, index=True)
+    attempt_count = fields.Integer(string="Attempts", default=0)
+    next_attempt = fields.Datetime(string="Next Attempt", default=fields.Datetime.now)
+    error_message = fields.Text(string="Error")
+
+    @api.model
+    def _enqueue(self, vals_list):
+        """ Queue notifications and wake up the dispatcher. Nothing is rendered
+        nor sent here, so this is cheap enough to call from generation loops. """
+        notifications = self.create(vals_list)
+        if notifications:
+            self.env.ref('hr_appraisal.ir_cron_dispatch_appraisal_notifications')._trigger()
+        return notifications
+
+    @api.model
+    def _cron_dispatch(self):
+        """ Send the due notifications, at most ``hr_appraisal.notification_batch_size``
+        per run. The emails are further capped to ``hr_appraisal.notification_mail_limit``
+        per run (0 for no other cap than the batch size), which together with
+        the interval of the scheduled action limits the rate at which the
+        mail server is fed. """
+        ICP = self.env['ir.config_parameter'].sudo()
+        batch_size = int(ICP.get_param('hr_appraisal.notification_batch_size', 100))
+        mail_limit = int(ICP.get_param('hr_appraisal.notification_mail_limit', 0))
+        domain = [
+            ('state', '=', 'pending'),
+            ('next_attempt', '<=', fields.Datetime.now()),
+        ]
+        bus_notifications = self.search(domain + [('notification_type', '=', 'bus')], limit=batch_size)
+        mail_notifications = self.search(domain + [('notification_type', '=', 'mail')],
+                                         limit=min(batch_size, mail_limit) if mail_limit > 0 else batch_size)
+        (bus_notifications + mail_notifications)._dispatch()
+
+    def _dispatch(self):
+        with PhaseTimer(self.env, 'dispatch_notifications', _logger) as timer:
+            bus_notifications = self.filtered(lambda n: n.notification_type == 'bus')
+            mail_notifications = self - bus_notifications
+            timer.count(bus=len(bus_notifications), mail=len(mail_notifications))
+            if bus_notifications:
+                with timer.phase('bus'):
+                    self.env['bus.bus']._sendmany([
+                        (notification.partner_id, 'notification', notification.payload)
+                        for notification in bus_notifications
+                    ])
+                    bus_notifications.write({'state': 'sent'})
+
+            if not mail_notifications:
+                return
+
+            # Render the emails of a template in one batch
+            with timer.phase('mail_render'):
+                to_render = mail_notifications.filtered(lambda n: not n.mail_id)
+                for template in to_render.template_id:
+                    batch = to_render.filtered(lambda n: n.template_id == template)
+                    mails = template.send_mail_batch([notification.appraisal_id.id for notification in batch],
+                                                     email_values={'scheduled_date': HELD_MAIL_DATE})
+                    for notification, mail in zip(batch, mails):
+                        notification.mail_id = mail
+
+            # mail.mail.send() opens one SMTP connection per mail server and
+            # reuses it for the whole batch
+            with timer.phase('mail_send'):
+                mails = mail_notifications.mail_id
+                mails.filtered(lambda mail: mail.state == 'exception').mark_outgoing()
+                mails.write({'scheduled_date': False})
+                mails.send(raise_exception=False)
+
+            # Sent mails may have been deleted already (auto_delete); those
+            # still outgoing, e.g. when the server could not be reached, stay
+            # queued for the next run
+            remaining = mails.exists()
+            remaining.filtered(lambda mail: mail.state in ('outgoing', 'exception')).write({
+                'scheduled_date': HELD_MAIL_DATE,
+            })
+            sent = mail_notifications.filtered(
+                lambda n: n.mail_id not in remaining or n.mail_id.state == 'sent')
+            failed = mail_notifications.filtered(
+                lambda n: n.mail_id in remaining and n.mail_id.state in ('exception', 'cancel'))
+            sent.write({'state': 'sent'})
+            failed._schedule_retry()
+            timer.count(sent=len(sent), failed=len(failed),
+                        queued=len(mail_notifications) - len(sent) - len(failed))
+
+    def _schedule_retry(self):
+        max_attempts = int(self.env['ir.config_parameter'].sudo().get_param(
+            'hr_appraisal.notification_max_attempts', 5))
+        now = fields.Datetime.now()
+        for notification in self:
+            attempt_count = notification.attempt_count + 1
+            notification.write({
+                'attempt_count': attempt_count,
+                'state': 'failed' if attempt_count >= max_attempts else 'pending',
+                'next_attempt': now + timedelta(minutes=5 * 2 ** attempt_count),
+                'error_message': notification.mail_id.failure_reason,
+            })
+            _logger.warning("Appraisal notification %s failed (attempt %s): %s",
+                            notification.id, attempt_count, notification.error_message)
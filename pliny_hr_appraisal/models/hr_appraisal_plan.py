@@ -1,9 +1,33 @@
-from odoo import models, fields, api
+from collections import Counter
+from odoo import models, fields, api, tools
 import logging
-from odoo.exceptions import ValidationError
+import time
+from odoo.exceptions import UserError, ValidationError
+
+from ..tools.concurrency import claim_rows, try_lock
+from ..tools.profiling import PhaseTimer, timed
 
 _logger = logging.getLogger(__name__)
 
+# Counter column of the plan for each appraisal state
+APPRAISAL_STATE_COUNTERS = {
+    'draft': 'appraisal_draft_count',
+    'submitted': 'appraisal_submitted_count',
+    'manager_review': 'appraisal_manager_review_count',
+    'done': 'appraisal_done_count',
+    'cancelled': 'appraisal_cancelled_count',
+}
+# States in which an appraisal past its deadline is late
+APPRAISAL_OPEN_STATES = ('draft', 'submitted', 'manager_review')
+# Every counter of the plan, summed from hr.appraisal.plan.counter
+APPRAISAL_COUNTERS = [*APPRAISAL_STATE_COUNTERS.values(), 'appraisal_overdue_count']
+# Scheduled actions sharing the background generation
+GENERATION_CRONS = [
+    'hr_appraisal.ir_cron_generate_appraisals',
+    'hr_appraisal.ir_cron_generate_appraisals_2',
+    'hr_appraisal.ir_cron_generate_appraisals_3',
+]
+
 class AppraisalPlan(models.Model):
     _name = "hr.appraisal.plan"
     _description = "List of the Appraisals the company plans to do"
@@ -22,6 +46,28 @@ class AppraisalPlan(models.Model):
     allocation_ids = fields.One2many('hr.appraisal.plan.allocation', 'plan_id', string="Allocations")
     question_ids = fields.One2many('hr.appraisal.plan.question', 'plan_id', string="Questions")
     category_id = fields.Many2one('hr.appraisal.category', string="Appraisal Category")
+    generation_state = fields.Selection([
+        ('none', 'Not Queued'),
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+    ], string="Background Generation", default='none', readonly=True, copy=False)
+    generation_total = fields.Integer(string="Allocations to Process", readonly=True, copy=False)
+    generation_done = fields.Integer(string="Allocations Processed", compute="_compute_generation_done")
+    generation_start = fields.Datetime(string="Generation Started", readonly=True, copy=False)
+    generation_progress = fields.Float(string="Generation Progress", compute="_compute_generation_progress")
+    generation_eta = fields.Datetime(string="Estimated Completion", compute="_compute_generation_progress")
+    appraisal_ids = fields.One2many('hr.appraisal', 'plan_id', string="Appraisals")
+    # Summed from the deltas that hr.appraisal create/write/unlink append, see
+    # _apply_appraisal_counters
+    appraisal_draft_count = fields.Integer(string="Draft", compute="_compute_appraisal_counters")
+    appraisal_submitted_count = fields.Integer(string="Submitted", compute="_compute_appraisal_counters")
+    appraisal_manager_review_count = fields.Integer(string="Manager Review", compute="_compute_appraisal_counters")
+    appraisal_done_count = fields.Integer(string="Completed", compute="_compute_appraisal_counters")
+    appraisal_cancelled_count = fields.Integer(string="Cancelled", compute="_compute_appraisal_counters")
+    appraisal_overdue_count = fields.Integer(string="Overdue", compute="_compute_appraisal_counters",
+        help="Appraisals not completed yet whose deadline has passed, as of the last daily update.")
+    completion_rate = fields.Float(string="Completion (%)", compute="_compute_appraisal_counters")
 
     @api.constrains('deadline')
     def _check_deadline(self):
@@ -37,6 +83,118 @@ class AppraisalPlan(models.Model):
                 if record.end_date <= record.start_date:
                     raise ValidationError("The end date has to be after the start date")
 
+    @api.depends('generation_state', 'generation_total')
+    def _compute_generation_done(self):
+        # Derived from the remaining draft allocations, so that the workers
+        # sharing a plan never write to its row
+        remaining = dict(self.env['hr.appraisal.plan.allocation']._read_group(
+            [('plan_id', 'in', self.ids), ('state', '=', 'draft')],
+            ['plan_id'], ['__count'],
+        ))
+        for plan in self:
+            if plan.generation_state == 'done':
+                plan.generation_done = plan.generation_total
+            elif plan.generation_state == 'running':
+                plan.generation_done = max(plan.generation_total - remaining.get(plan._origin, 0), 0)
+            else:
+                plan.generation_done = 0
+
+    @api.depends('generation_state', 'generation_total', 'generation_done', 'generation_start')
+    def _compute_generation_progress(self):
+        now = fields.Datetime.now()
+        for plan in self:
+            if plan.generation_state == 'done':
+                plan.generation_progress = 100.0
+            elif plan.generation_total:
+                plan.generation_progress = min(100.0, plan.generation_done * 100.0 / plan.generation_total)
+            else:
+                plan.generation_progress = 0.0
+            plan.generation_eta = False
+            if plan.generation_state == 'running' and plan.generation_done and plan.generation_start:
+                elapsed = now - plan.generation_start
+                remaining = max(plan.generation_total - plan.generation_done, 0)
+                plan.generation_eta = now + elapsed * remaining / plan.generation_done
+
+    def _compute_appraisal_counters(self):
+        counters = {
+            plan: sums
+            for plan, *sums in self.env['hr.appraisal.plan.counter'].sudo()._read_group(
+                [('plan_id', 'in', self.ids)],
+                ['plan_id'], [f'{column}:sum' for column in APPRAISAL_COUNTERS],
+            )
+        }
+        for plan in self:
+            sums = counters.get(plan._origin) or [0] * len(APPRAISAL_COUNTERS)
+            for column, total in zip(APPRAISAL_COUNTERS, sums):
+                plan[column] = total or 0
+            expected = sum(plan[column] for column in APPRAISAL_STATE_COUNTERS.values()) - plan.appraisal_cancelled_count
+            plan.completion_rate = plan.appraisal_done_count * 100.0 / expected if expected else 0.0
+
+    def init(self):
+        self._sync_appraisal_counters()
+
+    @api.model
+    def _cron_sync_appraisal_counters(self):
+        self._sync_appraisal_counters()
+
+    @api.model
+    def _sync_appraisal_counters(self):
+        """ Replace the counter deltas by a recount of the appraisals of every
+        plan. The counters are kept up to date incrementally, this compacts
+        their deltas and rolls the overdue count over to the new day.
+
+        The deltas appended by concurrent transactions are neither visible
+        to the DELETE nor included in the recount, so they stay and remain
+        correct on top of it. """
+        self.env['hr.appraisal'].flush_model(['plan_id', 'state', 'deadline'])
+        aggregates = ", ".join(
+            f"COUNT(*) FILTER (WHERE state = '{state}')"
+            for state in APPRAISAL_STATE_COUNTERS
+        )
+        self.env.cr.execute("DELETE FROM hr_appraisal_plan_counter")
+        self.env.cr.execute(f"""
+            INSERT INTO hr_appraisal_plan_counter (plan_id, {", ".join(APPRAISAL_COUNTERS)})
+            SELECT plan_id, {aggregates},
+                   COUNT(*) FILTER (WHERE state IN %(open_states)s AND deadline < %(today)s)
+              FROM hr_appraisal
+             WHERE plan_id IS NOT NULL
+          GROUP BY plan_id
+        """, {'open_states': APPRAISAL_OPEN_STATES, 'today': fields.Date.context_today(self)})
+        self.invalidate_model(APPRAISAL_COUNTERS + ['completion_rate'])
+
+    @api.model
+    def _get_appraisal_counters(self, appraisals):
+        """ Return the contribution of ``appraisals`` to the counters of their
+        plans, as a ``Counter`` of ``(plan_id, column)``. """
+        today = fields.Date.context_today(self)
+        counters = Counter()
+        for appraisal in appraisals:
+            if not appraisal.plan_id or appraisal.state not in APPRAISAL_STATE_COUNTERS:
+                continue
+            counters[appraisal.plan_id.id, APPRAISAL_STATE_COUNTERS[appraisal.state]] += 1
+            if appraisal.state in APPRAISAL_OPEN_STATES and appraisal.deadline and appraisal.deadline < today:
+                counters[appraisal.plan_id.id, 'appraisal_overdue_count'] += 1
+        return counters
+
+    @api.model
+    def _apply_appraisal_counters(self, deltas):
+        """ Add ``deltas`` (see ``_get_appraisal_counters``) to the counters by
+        appending one row per plan to ``hr.appraisal.plan.counter``. Nothing
+        is updated in place, so concurrent transitions of the same plan do not
+        conflict on its row. """
+        plan_ids = sorted({plan_id for (plan_id, column), delta in deltas.items() if delta})
+        if not plan_ids:
+            return
+        rows = [
+            (plan_id, *(deltas.get((plan_id, column), 0) for column in APPRAISAL_COUNTERS))
+            for plan_id in plan_ids
+        ]
+        self.env.cr.execute(f"""
+            INSERT INTO hr_appraisal_plan_counter (plan_id, {", ".join(APPRAISAL_COUNTERS)})
+            VALUES {", ".join(["%s"] * len(rows))}
+        """, rows)
+        self.browse(plan_ids).invalidate_recordset(APPRAISAL_COUNTERS + ['completion_rate'])
+
     def open_add_employees_wizard(self):
         self.ensure_one()
         return {
@@ -49,92 +207,61 @@ class AppraisalPlan(models.Model):
             }
         }
 
-    def action_generate_appraisals(self):
-        Appraisal = self.env['hr.appraisal']
-        created = 0
+    def action_complete_reviewed_appraisals(self):
+        """ Close out the cycle: complete every appraisal of the plans that the
+        manager has reviewed, in one write. """
+        appraisals = self.env['hr.appraisal'].search([
+            ('plan_id', 'in', self.ids),
+            ('state', '=', 'manager_review'),
+        ])
+        appraisals.action_complete()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': "Appraisal Completion",
+                'message': f"{len(appraisals)} appraisal(s) completed.",
+                'type': 'success' if appraisals else 'warning',
+                'next': {'type': 'ir.actions.client', 'tag': 'soft_reload'},
+            }
+        }
 
-        for plan in self:
-            _logger.info(f"▶ Processing plan: {plan.name} (ID: {plan.id})")
-            _logger.info(f"▶ Total allocations: {len(plan.allocation_ids)}")
-
-            for alloc in plan.allocation_ids:
-                if not alloc.employee_id:
-                    _logger.warning(f"⚠ Skipping allocation with no employee set.")
-                    continue
-
-                employee = alloc.employee_id
-                _logger.info(f"👤 Checking employee: {employee.name} (ID: {employee.id})")
-
-                # Check for existing appraisal
-                existing = Appraisal.search([
-                    ('employee_id', '=', employee.id),
-                    ('plan_id', '=', plan.id)
-                ], limit=1)
-
-                if existing:
-                    _logger.warning(f"⛔ Appraisal already exists for {employee.name}")
-                    continue
-
-                _logger.info(f"✅ Creating appraisal for {employee.name}")
-
-                appraisal = self.env['hr.appraisal'].create({
-                    'employee_id': employee.id,
-                    'plan_id': plan.id,
-                    'start_date': plan.start_date,
-                    'end_date': plan.end_date,
-                    'deadline': plan.deadline,
-                    'category_id': plan.category_id.id if plan.category_id else False,
-                    'manager_id': employee.parent_id.id if employee.parent_id else False,
-                    'job_id': employee.job_id.id if employee.job_id else False,
-                    'department_id': employee.department_id.id if employee.job_id else False,
-                    'state': 'draft',
-                })
-                created += 1
-
-                # Mark allocation as allocated ✅
-                alloc.state = 'allocated'
-
-                # Move questions to appraisal question
-                for question_template in plan.question_ids:
-                    self.env['hr.appraisal.question'].create({
-                        'appraisal_id': appraisal.id,
-                        'name': question_template.name,
-                        'description': question_template.description,
-                        'maximum_value': question_template.maximum_value,
-                    })
-
-                # In-app Notification
-                if employee.user_id and employee.user_id.partner_id:
-                    self.env['bus.bus']._sendone(
-                        employee.user_id.partner_id,
-                        'notification',
-                        {
-                            'type': 'info',
-                            'title': "New Appraisal Assigned",
-                            'message': f"You have a new appraisal under the plan: {plan.name}",
-                        }
-                    )
-
-
-                # Email Notification - Employer
-                template = self.env.ref('hr_evaluation.mail_template_appraisal_allocated_employee', raise_if_not_found=False)
-                if template and employee.work_email:
-                    try:
-                        template.send_mail(appraisal.id, force_send=True)
-                        _logger.info(f"📧 Email sent to {employee.work_email} for appraisal {appraisal.id}")
-                    except Exception as e:
-                        _logger.error(f"❌ Failed to send email for {employee.name}: {str(e)}")
-
-                # Email Notification - Manager
-                template = self.env.ref('hr_evaluation.mail_template_appraisal_allocated_manager', raise_if_not_found=False)
-                if template and employee.work_email:
-                    try:
-                        template.send_mail(appraisal.id, force_send=True)
-                        _logger.info(f"📧 Email sent to {employee.work_email} for appraisal {appraisal.id}")
-                    except Exception as e:
-                        _logger.error(f"❌ Failed to send email for {employee.name}: {str(e)}")
-
-        _logger.info(f"✅ Total appraisals created: {created}")
+    def action_export_results_xlsx(self):
+        return self._get_export_action('xlsx')
+
+    def action_export_results_csv(self):
+        return self._get_export_action('csv')
+
+    def _get_export_action(self, file_format):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/hr_appraisal/export/appraisal/{self.id}/{file_format}',
+            'target': 'self',
+        }
+
+    def action_generate_appraisals(self):
+        queued = self.filtered(lambda plan: plan.generation_state in ('queued', 'running'))
+        if queued:
+            raise UserError(
+                "The appraisals of %s are being generated in the background. Please wait until it is done."
+                % ", ".join(queued.mapped('name'))
+            )
+        busy = self - try_lock(self)
+        if busy:
+            raise UserError(
+                "The appraisals of %s are already being generated. Please try again once it is done."
+                % ", ".join(busy.mapped('name'))
+            )
+        with PhaseTimer(self.env, 'generate_appraisals', _logger) as timer:
+            with timer.phase('db'):
+                allocations = self.allocation_ids
+                appraisals = allocations._generate_appraisals()
+            with timer.phase('notify'):
+                self._notify_allocated_appraisals(appraisals)
+            created = len(appraisals)
+            timer.count(plans=len(self), allocations=len(allocations), created=created,
+                        skipped=len(allocations) - created)
 
         return {
             'type': 'ir.actions.client',
@@ -146,8 +273,175 @@ class AppraisalPlan(models.Model):
             }
         }
 
+    def action_generate_appraisals_async(self):
+        """ Queue the generation of the appraisals of these plans; the work is
+        done in chunks by the ``_cron_generate_appraisals`` scheduled action. """
+        pending = dict(self.env['hr.appraisal.plan.allocation']._read_group(
+            [('plan_id', 'in', self.ids), ('state', '=', 'draft')],
+            ['plan_id'], ['__count'],
+        ))
+        for plan in self:
+            plan.write({
+                'generation_state': 'queued',
+                'generation_total': pending.get(plan, 0),
+                'generation_start': False,
+            })
+        self._trigger_generation_workers()
+
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': "Appraisal Generation",
+                'message': "The appraisals will be generated in the background.",
+                'type': 'info',
+            }
+        }
+
+    @api.model
+    def _cron_generate_appraisals(self, chunk_size=None, time_limit=240):
+        """ Work through the draft allocations of the queued plans in chunks,
+        committing after each chunk. Allocations are flagged as allocated in
+        the same transaction as their appraisals, so a run interrupted by a
+        crash or a timeout resumes from the remaining draft allocations.
+
+        Every chunk is claimed with ``FOR UPDATE SKIP LOCKED``, so the
+        scheduled actions of ``GENERATION_CRONS`` share the work, including
+        the allocations of a single large plan. """
+        chunk_size = chunk_size or int(self.env['ir.config_parameter'].sudo().get_param(
+            'hr_appraisal.generation_chunk_size', 500))
+        end_time = time.monotonic() + time_limit
+        with PhaseTimer(self.env, 'cron_generate_appraisals', _logger) as timer:
+            self._generate_queued_appraisals(chunk_size, end_time, timer)
+
+    def _generate_queued_appraisals(self, chunk_size, end_time, timer):
+        Allocation = self.env['hr.appraisal.plan.allocation']
+        self._start_queued_generations()
+        while True:
+            if time.monotonic() > end_time:
+                self._trigger_generation_workers()
+                return
+
+            with timer.phase('db'):
+                allocations = Allocation._claim_generation_chunk(chunk_size)
+            if allocations is None:
+                # Another worker committed since our snapshot: take a new one
+                self._commit_generation_progress()
+                timer.count(conflicts=1)
+                continue
+            if not allocations:
+                break
+
+            with timer.phase('db'):
+                appraisals = allocations._generate_appraisals()
+            with timer.phase('notify'):
+                self._notify_allocated_appraisals(appraisals)
+            with timer.phase('commit'):
+                self._commit_generation_progress()
+            timer.count(chunks=1, allocations=len(allocations), created=len(appraisals),
+                        skipped=len(allocations) - len(appraisals))
+        self._finish_generations()
+
+    @api.model
+    def _start_queued_generations(self):
+        self.flush_model(['generation_state'])
+        plans = claim_rows(self, """
+            SELECT id FROM hr_appraisal_plan
+             WHERE generation_state = 'queued'
+               FOR UPDATE SKIP LOCKED
+        """, [])
+        if plans:
+            plans.write({
+                'generation_state': 'running',
+                'generation_start': fields.Datetime.now(),
+            })
+            self._commit_generation_progress()
+
+    @api.model
+    def _finish_generations(self):
+        """ Flag as done the running plans without draft allocations left; the
+        plans still locked by another worker are left to it. """
+        self.flush_model(['generation_state'])
+        self.env['hr.appraisal.plan.allocation'].flush_model(['plan_id', 'state'])
+        plans = claim_rows(self, """
+            SELECT plan.id FROM hr_appraisal_plan plan
+             WHERE plan.generation_state = 'running'
+               AND NOT EXISTS (
+                       SELECT 1 FROM hr_appraisal_plan_allocation alloc
+                        WHERE alloc.plan_id = plan.id AND alloc.state = 'draft')
+               FOR UPDATE SKIP LOCKED
+        """, [])
+        if plans:
+            plans.generation_state = 'done'
+            self._commit_generation_progress()
+
+    @api.model
+    def _trigger_generation_workers(self):
+        for xmlid in GENERATION_CRONS:
+            cron = self.env.ref(xmlid, raise_if_not_found=False)
+            if cron:
+                cron._trigger()
+
+    def _commit_generation_progress(self):
+        if not self.env.registry.in_test_mode():
+            self.env.cr.commit()
+
+    def _notify_allocated_appraisals(self, appraisals):
+        """ Queue the in-app notification of the employees and the allocation
+        emails of the employees and their managers; they are sent in batches
+        by the ``hr.appraisal.notification`` dispatcher. """
+        employee_template = self.env.ref('hr_appraisal.mail_template_appraisal_allocated_employee', raise_if_not_found=False)
+        manager_template = self.env.ref('hr_appraisal.mail_template_appraisal_allocated_manager', raise_if_not_found=False)
+
+        vals_list = []
+        for appraisal in appraisals:
+            employee = appraisal.employee_id
+
+            # In-app Notification
+            if employee.user_id.partner_id:
+                vals_list.append({
+                    'notification_type': 'bus',
+                    'appraisal_id': appraisal.id,
+                    'partner_id': employee.user_id.partner_id.id,
+                    'payload': {
+                        'type': 'info',
+                        'title': "New Appraisal Assigned",
+                        'message': f"You have a new appraisal under the plan: {appraisal.plan_id.name}",
+                    },
+                })
+
+            # Email Notification - Employee and Manager
+            if employee_template and employee.work_email:
+                vals_list.append({
+                    'notification_type': 'mail',
+                    'appraisal_id': appraisal.id,
+                    'template_id': employee_template.id,
+                })
+            if manager_template and appraisal.manager_id.work_email:
+                vals_list.append({
+                    'notification_type': 'mail',
+                    'appraisal_id': appraisal.id,
+                    'template_id': manager_template.id,
+                })
+
+        self.env['hr.appraisal.notification']._enqueue(vals_list)
 
 
+class AppraisalPlanCounter(models.Model):
+    _name = "hr.appraisal.plan.counter"
+    _description = "Appraisal Plan Counter Deltas"
+    _log_access = False
+
+    # Append-only: the counters of a plan are the sums of its rows, which the
+    # daily _sync_appraisal_counters compacts into one row per plan
+    plan_id = fields.Many2one('hr.appraisal.plan', string="Appraisal Plan", required=True, index=True, ondelete='cascade')
+    appraisal_draft_count = fields.Integer(string="Draft")
+    appraisal_submitted_count = fields.Integer(string="Submitted")
+    appraisal_manager_review_count = fields.Integer(string="Manager Review")
+    appraisal_done_count = fields.Integer(string="Completed")
+    appraisal_cancelled_count = fields.Integer(string="Cancelled")
+    appraisal_overdue_count = fields.Integer(string="Overdue")
+
 
 class AppraisalPlanAllocation(models.Model):
     _name = "hr.appraisal.plan.allocation"
@@ -155,13 +449,106 @@ class AppraisalPlanAllocation(models.Model):
 
 
     plan_id = fields.Many2one('hr.appraisal.plan', string="Appraisal Plan")
-    employee_id = fields.Many2one('hr.employee', string="Employee", required=True)
+    employee_id = fields.Many2one('hr.employee', string="Employee", required=True, index=True)
     notes = fields.Char(string="Notes")
     state = fields.Selection([
         ('draft', 'Draft'),
         ('allocated', 'Allocated'),
     ], string="Status", default='draft')
 
+    _sql_constraints = [
+        ('plan_employee_uniq', 'unique(plan_id, employee_id)', 'This employee is already allocated to this appraisal plan.'),
+    ]
+
+    def init(self):
+        # The background generation pages through the draft allocations
+        tools.create_index(self.env.cr, 'hr_appraisal_plan_allocation_draft_index', self._table,
+                           ['plan_id', 'id'], where="state = 'draft'")
+
+    @api.model
+    def _claim_generation_chunk(self, chunk_size):
+        """ Lock the next ``chunk_size`` draft allocations of the running plans,
+        skipping those claimed by another worker.
+
+        :return: the claimed allocations, or ``None`` when the transaction
+                 should commit and try again (see ``claim_rows``)
+        """
+        self.flush_model(['plan_id', 'state'])
+        self.env['hr.appraisal.plan'].flush_model(['generation_state'])
+        return claim_rows(self, """
+            SELECT alloc.id
+              FROM hr_appraisal_plan_allocation alloc
+              JOIN hr_appraisal_plan plan ON plan.id = alloc.plan_id
+             WHERE alloc.state = 'draft'
+               AND plan.generation_state = 'running'
+          ORDER BY alloc.plan_id, alloc.id
+             LIMIT %s
+               FOR UPDATE OF alloc SKIP LOCKED
+        """, [chunk_size])
+
+    def _prepare_appraisal_vals(self):
+        self.ensure_one()
+        plan = self.plan_id
+        employee = self.employee_id
+        return {
+            'employee_id': employee.id,
+            'plan_id': plan.id,
+            'start_date': plan.start_date,
+            'end_date': plan.end_date,
+            'deadline': plan.deadline,
+            'category_id': plan.category_id.id,
+            'manager_id': employee.parent_id.id,
+            'job_id': employee.job_id.id,
+            'department_id': employee.department_id.id,
+            'employee_user_id': employee.user_id.id,
+            'manager_user_id': employee.parent_id.user_id.id,
+            'state': 'draft',
+        }
+
+    @timed('allocation_generate_appraisals')
+    def _generate_appraisals(self):
+        """ Create the missing appraisals of these allocations in bulk.
+
+        The appraisals are inserted with ``_create_missing``, which skips the
+        (plan, employee) pairs that already have one, even when another
+        transaction generates the same plan. Their questions are created with
+        one ``create`` and the allocations are flagged as allocated in a single
+        write, including those whose appraisal already existed.
+
+        :return: the created ``hr.appraisal`` records
+        """
+        Appraisal = self.env['hr.appraisal']
+        allocations = self.filtered(lambda alloc: alloc.plan_id and alloc.employee_id)
+        if not allocations:
+            return Appraisal
+
+        appraisals = Appraisal._create_missing([alloc._prepare_appraisal_vals() for alloc in allocations])
+
+        if _logger.isEnabledFor(logging.DEBUG):
+            created = {(appraisal.plan_id.id, appraisal.employee_id.id) for appraisal in appraisals}
+            for alloc in allocations:
+                if (alloc.plan_id.id, alloc.employee_id.id) in created:
+                    _logger.debug("Allocation %s: appraisal created for employee %s on plan %s",
+                                  alloc.id, alloc.employee_id.id, alloc.plan_id.id)
+                else:
+                    _logger.debug("Allocation %s skipped: employee %s already has an appraisal for plan %s",
+                                  alloc.id, alloc.employee_id.id, alloc.plan_id.id)
+
+        # Link the appraisals to the frozen questions of their plan
+        QuestionTemplate = self.env['hr.appraisal.question.template']
+        templates = {plan: QuestionTemplate._get_template(plan) for plan in appraisals.plan_id}
+        self.env['hr.appraisal.question'].create([
+            {
+                'appraisal_id': appraisal.id,
+                'template_line_id': line.id,
+            }
+            for appraisal in appraisals
+            for line in templates[appraisal.plan_id].line_ids
+        ])
+
+        allocations.write({'state': 'allocated'})
+        return appraisals
+
     #Prevent deletion of records that have been allocated
     def unlink(self):
             for record in self:
@@ -175,7 +562,7 @@ class AppraisalPlanQuestion(models.Model):
     _description = "List of questions every employee under this plan must be asked"
 
 
-    plan_id = fields.Many2one('hr.appraisal.plan', string="Appraisal Plan")
+    plan_id = fields.Many2one('hr.appraisal.plan', string="Appraisal Plan", index=True)
     name = fields.Char(string="Question", required=True)
     description = fields.Char(string="Description")
     score_id = fields.Many2one('hr.appraisal.score', related="plan_id.score_id", string="Scoring System", readonly=True)
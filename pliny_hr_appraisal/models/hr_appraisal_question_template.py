@@ -0,0 +1,116 @@
+from odoo import models, fields, api, Command, _
+from odoo.exceptions import UserError
+from odoo.tools import sql
+
+
+class AppraisalQuestionTemplate(models.Model):
+    _name = "hr.appraisal.question.template"
+    _description = "Frozen version of the questions of an appraisal or 360 plan"
+    _order = "version desc, id desc"
+
+    appraisal_plan_id = fields.Many2one('hr.appraisal.plan', string="Appraisal Plan", ondelete='cascade', index=True)
+    threesixty_plan_id = fields.Many2one('hr.threesixty.plan', string="360 Plan", ondelete='cascade', index=True)
+    version = fields.Integer(string="Version", required=True, default=1)
+    line_ids = fields.One2many('hr.appraisal.question.template.line', 'template_id', string="Questions")
+
+    def write(self, vals):
+        if 'line_ids' in vals or 'version' in vals:
+            raise UserError(_("Question templates are frozen once created."))
+        return super().write(vals)
+
+    @api.model
+    def _get_template(self, plan):
+        """ Return the latest template of ``plan`` (an appraisal or 360 plan)
+        if it still matches the plan's questions, or freeze them into a new
+        version. Appraisals and reviews only reference the template lines, so
+        the question texts are stored once per version instead of once per
+        employee. """
+        plan_field = 'appraisal_plan_id' if plan._name == 'hr.appraisal.plan' else 'threesixty_plan_id'
+        snapshot = [
+            (question.name, question.description or False, question.maximum_value)
+            for question in plan.question_ids
+        ]
+        latest = self.search([(plan_field, '=', plan.id)], limit=1)
+        if latest and [(line.name, line.description or False, line.maximum_value) for line in latest.line_ids] == snapshot:
+            return latest
+        return self.create({
+            plan_field: plan.id,
+            'version': latest.version + 1,
+            'line_ids': [
+                Command.create({'sequence': sequence, 'name': name, 'description': description, 'maximum_value': maximum_value})
+                for sequence, (name, description, maximum_value) in enumerate(snapshot)
+            ],
+        })
+
+    @api.model
+    def _freeze_legacy_questions(self, question_table, plan_field, plan_expression):
+        """ Link the answer rows of ``question_table`` created before templates
+        existed to a version 0 template of their plan, then drop the question
+        texts they used to duplicate.
+
+        :param plan_field: template column referencing the plan
+        :param plan_expression: SQL expression giving the plan of answer row ``q``
+        """
+        cr = self.env.cr
+        if not sql.column_exists(cr, question_table, 'name'):
+            return
+        other_field = 'threesixty_plan_id' if plan_field == 'appraisal_plan_id' else 'appraisal_plan_id'
+        template_match = f"""
+            t.version = 0
+            AND t.{plan_field} IS NOT DISTINCT FROM {plan_expression}
+            AND t.{other_field} IS NULL
+        """
+        line_match = """
+            l.template_id = t.id
+            AND l.name = q.name
+            AND l.description IS NOT DISTINCT FROM q.description
+            AND l.maximum_value IS NOT DISTINCT FROM q.maximum_value
+        """
+        cr.execute(f"""
+            INSERT INTO hr_appraisal_question_template ({plan_field}, version, create_uid, create_date, write_uid, write_date)
+                 SELECT DISTINCT {plan_expression}, 0, %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+                   FROM {question_table} q
+                  WHERE q.template_line_id IS NULL
+                    AND NOT EXISTS (SELECT 1 FROM hr_appraisal_question_template t WHERE {template_match})
+        """, {'uid': self.env.uid})
+        cr.execute(f"""
+            INSERT INTO hr_appraisal_question_template_line
+                        (template_id, sequence, name, description, maximum_value, create_uid, create_date, write_uid, write_date)
+                 SELECT t.id, MIN(q.id), q.name, q.description, q.maximum_value,
+                        %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+                   FROM {question_table} q
+                   JOIN hr_appraisal_question_template t ON {template_match}
+                  WHERE q.template_line_id IS NULL
+                    AND NOT EXISTS (SELECT 1 FROM hr_appraisal_question_template_line l WHERE {line_match})
+               GROUP BY t.id, q.name, q.description, q.maximum_value
+        """, {'uid': self.env.uid})
+        cr.execute(f"""
+            UPDATE {question_table} q
+               SET template_line_id = l.id
+              FROM hr_appraisal_question_template t
+              JOIN hr_appraisal_question_template_line l ON l.template_id = t.id
+             WHERE q.template_line_id IS NULL
+               AND {template_match}
+               AND {line_match}
+        """)
+        cr.execute(f"""
+            ALTER TABLE {question_table}
+                DROP COLUMN name,
+                DROP COLUMN description,
+                DROP COLUMN maximum_value
+        """)
+
+
+class AppraisalQuestionTemplateLine(models.Model):
+    _name = "hr.appraisal.question.template.line"
+    _description = "Question of a frozen question template"
+    _order = "sequence, id"
+
+    template_id = fields.Many2one('hr.appraisal.question.template', string="Template", required=True, ondelete='cascade', index=True)
+    sequence = fields.Integer(string="Sequence", default=10)
+    name = fields.Char(string="Question", required=True)
+    description = fields.Char(string="Description")
+    maximum_value = fields.Integer(string="Maximum Score")
+
+    def write(self, vals):
+        raise UserError(_("The questions of a template are frozen once created."))
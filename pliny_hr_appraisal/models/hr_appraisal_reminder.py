@@ -0,0 +1,101 @@
+from collections import defaultdict
+from datetime import timedelta
+import logging
+
+from odoo import models, fields, api, _
+
+from .hr_appraisal_notification import HELD_MAIL_DATE
+
+_logger = logging.getLogger(__name__)
+
+
+class AppraisalReminder(models.AbstractModel):
+    _name = "hr.appraisal.reminder"
+    _description = "Deadline reminders of the appraisals and 360 reviews"
+
+    @api.model
+    def _cron_send_reminders(self):
+        """ Send one digest per employee listing their appraisals and 360
+        reviews due within ``hr_appraisal.reminder_lead_days`` days (overdue
+        ones included) that they were not reminded of yet.
+
+        Each record remembers the state and deadline of its last reminder, so
+        it is reminded again when it moves to the next person (a draft
+        appraisal submitted to the manager) or when its deadline, or the one
+        of its 360 plan, is changed; but only once per state and deadline.
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        lead_days = int(ICP.get_param('hr_appraisal.reminder_lead_days', 3))
+        params = {'horizon': fields.Date.context_today(self) + timedelta(days=lead_days)}
+        self.env['hr.appraisal'].flush_model(['employee_id', 'manager_id', 'state', 'deadline', 'reminded_state', 'reminded_deadline'])
+        self.env['hr.threesixty.review'].flush_model(['plan_id', 'reviewer_id', 'state', 'reminded_deadline'])
+        self.env['hr.threesixty.plan'].flush_model(['deadline'])
+
+        # Draft appraisals wait for the employee, submitted ones for the manager
+        self.env.cr.execute("""
+            UPDATE hr_appraisal
+               SET reminded_state = state, reminded_deadline = deadline
+             WHERE state IN ('draft', 'submitted')
+               AND deadline <= %(horizon)s
+               AND (reminded_state IS DISTINCT FROM state
+                    OR reminded_deadline IS DISTINCT FROM deadline)
+         RETURNING id, CASE WHEN state = 'draft' THEN employee_id ELSE manager_id END
+        """, params)
+        appraisal_rows = self.env.cr.fetchall()
+        self.env.cr.execute("""
+            UPDATE hr_threesixty_review review
+               SET reminded_deadline = plan.deadline
+              FROM hr_threesixty_plan plan
+             WHERE plan.id = review.plan_id
+               AND review.state = 'draft'
+               AND plan.deadline <= %(horizon)s
+               AND review.reminded_deadline IS DISTINCT FROM plan.deadline
+         RETURNING review.id, review.reviewer_id
+        """, params)
+        review_rows = self.env.cr.fetchall()
+        self.env['hr.appraisal'].invalidate_model(['reminded_state', 'reminded_deadline'])
+        self.env['hr.threesixty.review'].invalidate_model(['reminded_deadline'])
+
+        appraisal_ids = defaultdict(list)
+        for appraisal_id, employee_id in appraisal_rows:
+            if employee_id:
+                appraisal_ids[employee_id].append(appraisal_id)
+        review_ids = defaultdict(list)
+        for review_id, employee_id in review_rows:
+            review_ids[employee_id].append(review_id)
+
+        self._queue_digests(appraisal_ids, review_ids)
+
+    @api.model
+    def _queue_digests(self, appraisal_ids, review_ids):
+        """ Render one digest per employee and hand the emails over to the
+        notification outbox, which sends them in batches. """
+        Appraisal = self.env['hr.appraisal']
+        Review = self.env['hr.threesixty.review']
+        employees = self.env['hr.employee'].browse(set(appraisal_ids) | set(review_ids))
+        # Prefetch everything the digests display in a few queries
+        Appraisal.browse([id_ for ids in appraisal_ids.values() for id_ in ids]).fetch(['employee_id', 'plan_id', 'state', 'deadline'])
+        Review.browse([id_ for ids in review_ids.values() for id_ in ids]).fetch(['reviewed_id', 'plan_id'])
+
+        email_from = self.env.company.email_formatted or self.env.user.email_formatted
+        mail_values = []
+        for employee in employees.filtered('work_email'):
+            mail_values.append({
+                'subject': _("Appraisal deadlines approaching"),
+                'email_from': email_from,
+                'email_to': employee.work_email,
+                'body_html': self.env['ir.qweb']._render('hr_appraisal.appraisal_deadline_reminder', {
+                    'employee': employee,
+                    'appraisals': Appraisal.browse(appraisal_ids.get(employee.id, [])),
+                    'reviews': Review.browse(review_ids.get(employee.id, [])),
+                }),
+                'auto_delete': True,
+                'scheduled_date': HELD_MAIL_DATE,
+            })
+        mails = self.env['mail.mail'].sudo().create(mail_values)
+        self.env['hr.appraisal.notification']._enqueue([
+            {'notification_type': 'mail', 'mail_id': mail.id}
+            for mail in mails
+        ])
+        _logger.info("Appraisal reminders: %s digest(s) queued", len(mails))
+        return mails
@@ -1,19 +1,27 @@
-from odoo import models, fields, api, _
-from odoo.exceptions import ValidationError
+from odoo import models, fields, api, tools, _
+from odoo.exceptions import UserError, ValidationError
+
+from ..tools.concurrency import insert_missing
+from ..tools.profiling import timed
+
 
 class ThreeSixty(models.Model):
     _name = "hr.threesixty.review"
     _description = "Employee 360"
 
     #Name should be a many to One
-    plan_id = fields.Many2one('hr.threesixty.plan', string="360 Plan")
-    allocation_id = fields.Many2one('hr.threesixty.plan.allocation', string="Reviewer List")
+    plan_id = fields.Many2one('hr.threesixty.plan', string="360 Plan", index=True)
+    allocation_id = fields.Many2one('hr.threesixty.plan.allocation', string="Reviewer List", index=True)
     review_list_id = fields.Many2one('hr.threesixty.review.list', string="Reviewed List")
-    reviewer_id = fields.Many2one('hr.employee', string="Reviewer", required=True, readonly = True, related='allocation_id.reviewer_id', store=True)
-    reviewed_id = fields.Many2one('hr.employee', string="Reviewed", required=True, readonly = True, related='review_list_id.reviewed_id', store=True)
+    reviewer_id = fields.Many2one('hr.employee', string="Reviewer", required=True, readonly = True, related='allocation_id.reviewer_id', store=True, precompute=True, index=True)
+    reviewed_id = fields.Many2one('hr.employee', string="Reviewed", required=True, readonly = True, related='review_list_id.reviewed_id', store=True, precompute=True, index=True)
     submit_date = fields.Date(string="Submit Date", readonly=True)
     department_id = fields.Many2one('hr.department', string="Department")
     manager_id = fields.Many2one('hr.employee', string="Manager")
+    # Denormalised for the record rules and "My" menus, see hr.appraisal
+    reviewer_user_id = fields.Many2one(related='reviewer_id.user_id', string="Reviewer User", store=True, index=True, precompute=True)
+    reviewed_user_id = fields.Many2one(related='reviewed_id.user_id', string="Reviewed User", store=True, index=True, precompute=True)
+    manager_user_id = fields.Many2one(related='manager_id.user_id', string="Manager User", store=True, index=True, precompute=True)
     job_id = fields.Many2one('hr.job', string="Job Title")
     #total_score = fields.Integer(string="Total Score", compute="_compute_score", store=True)
     question_review_ids = fields.One2many('hr.threesixty.review.question', 'review_id', string="Questions")
@@ -28,6 +36,26 @@ class ThreeSixty(models.Model):
         ('draft', 'Draft'),
         ('done', 'Done'),
     ], string="Status", default='draft', tracking=True)
+    # Plan deadline of the last reminder sent, see hr.appraisal.reminder
+    reminded_deadline = fields.Date(string="Reminded Deadline", readonly=True, copy=False)
+
+    _sql_constraints = [
+        ('review_list_uniq', 'unique(review_list_id)', 'This review has already been generated.'),
+    ]
+
+    def init(self):
+        # Superseded by the index of the review_list_uniq constraint, once it
+        # could be created
+        if tools.sql.constraint_definition(self.env.cr, self._table, 'hr_threesixty_review_review_list_uniq'):
+            self.env.cr.execute("DROP INDEX IF EXISTS hr_threesixty_review__review_list_id_index")
+        else:
+            tools.create_index(self.env.cr, 'hr_threesixty_review__review_list_id_index', self._table, ['review_list_id'])
+        # The deadline reminders look for the draft reviews of the due plans
+        tools.create_index(self.env.cr, 'hr_threesixty_review_draft_plan_index', self._table,
+                           ['plan_id'], where="state = 'draft'")
+        # Covers the lookups of a review by its line and participants
+        tools.create_index(self.env.cr, 'hr_threesixty_review_list_participants_index', self._table,
+                           ['review_list_id', 'reviewer_id', 'reviewed_id', 'plan_id'])
 
     @api.onchange('reviewed_id')
     def _onchange_reviewed_id(self):
@@ -40,20 +68,31 @@ class ThreeSixty(models.Model):
             self.job_id = False
             self.manager_id= False
 
-    def action_submit(self):
-        for record in self:
-            if record.state != 'draft':
-                raise UserError(_("Only draft reviews can be submitted."))
-            record.state = 'done'
-            record.submit_date = fields.Date.today()
+    @api.model
+    def _create_missing(self, vals_list):
+        """ Create the reviews of ``vals_list`` whose review line has none yet,
+        in bulk, skipping those created meanwhile by another transaction
+        instead of failing on the unique constraint.
+
+        :return: the created reviews
+        """
+        return insert_missing(self, vals_list, ['review_list_id'])
 
-            # Also mark the parent review_list_id as done
-            if record.review_list_id:
-                record.review_list_id.state = 'done'
+    def action_submit(self):
+        if any(record.state != 'draft' for record in self):
+            raise UserError(_("Only draft reviews can be submitted."))
+        self.write({
+            'state': 'done',
+            'submit_date': fields.Date.today(),
+        })
+        # Also mark the parent review_list_id as done
+        self.review_list_id.write({'state': 'done'})
+        self.env['hr.threesixty.feedback.summary']._refresh(self.plan_id, self.reviewed_id)
 
     def action_draft(self):
         for record in self:
             record.state = 'draft'
+        self.env['hr.threesixty.feedback.summary']._refresh(self.plan_id, self.reviewed_id)
 
 class ThreeSixtyPlanReviewList(models.Model):
     _name = "hr.threesixty.review.list"
@@ -61,55 +100,77 @@ class ThreeSixtyPlanReviewList(models.Model):
 
 
     plan_id = fields.Many2one('hr.threesixty.plan', related="allocation_id.plan_id", string="360 Plan")
-    allocation_id = fields.Many2one('hr.threesixty.plan.allocation', string="Allocation List")
+    allocation_id = fields.Many2one('hr.threesixty.plan.allocation', string="Allocation List", index=True)
     state = fields.Selection([
         ('new', 'New'),
         ('active', 'Active'),
         ('done', 'Done'),
     ], string="Status", default='new')
-    reviewer_id = fields.Many2one('hr.employee', string="Reviewer",  related='allocation_id.reviewer_id', store=True)
-    reviewed_id = fields.Many2one('hr.employee', string="To be Reviewed")
+    reviewer_id = fields.Many2one('hr.employee', string="Reviewer",  related='allocation_id.reviewer_id', store=True, precompute=True, index=True)
+    reviewed_id = fields.Many2one('hr.employee', string="To be Reviewed", index=True)
+    reviewer_user_id = fields.Many2one(related='reviewer_id.user_id', string="Reviewer User", store=True, index=True, precompute=True)
     review_ids = fields.One2many('hr.threesixty.review', 'review_list_id', string="Reviews List")
 
-    def action_generate_review(self):
-        self.ensure_one()
-
-        self.state = "active"
-
-        # Check if a review already exists
-        existing_review = self.env['hr.threesixty.review'].search([
-            ('review_list_id', '=', self.id),
-            ('reviewer_id', '=', self.reviewer_id.id),
-            ('reviewed_id', '=', self.reviewed_id.id),
-            ('plan_id', '=', self.plan_id.id)
-        ], limit=1)
-
-        if not existing_review:
-            review = self.env['hr.threesixty.review'].create({
-                'plan_id': self.plan_id.id,
-                'allocation_id': self.allocation_id.id,
-                'review_list_id': self.id,
-                'reviewer_id': self.reviewer_id.id,
-                'reviewed_id': self.reviewed_id.id,
-                'department_id': self.reviewed_id.department_id.id,
-                'job_id': self.reviewed_id.job_id.id,
-                'manager_id': self.reviewed_id.parent_id.id,
-            })
-        # Clone questions from plan to the review
-            question_vals = []
-            for question in self.plan_id.question_ids:
-                question_vals.append({
-                    'plan_id': self.plan_id.id,
-                    'review_id': review.id,
-                    'name': question.name,
-                    'description': question.description,
-                    'maximum_value': question.maximum_value,
-                })
-            self.env['hr.threesixty.review.question'].create(question_vals)
+    _sql_constraints = [
+        ('allocation_reviewed_uniq', 'unique(allocation_id, reviewed_id)', 'This reviewer already reviews this employee.'),
+    ]
 
+    @timed('generate_reviews')
+    def _generate_reviews(self):
+        """ Create the missing review of each line, with the questions of its
+        plan, and activate the new lines.
+
+        The reviews are inserted with ``_create_missing``, which skips the
+        lines that already have one, even when another transaction generates
+        them at the same time. Their questions are created with one
+        ``create`` and the states are flipped in a single write. The lines
+        without a reviewer or an employee to review are skipped, as a review
+        requires both.
+
+        :return: the created ``hr.threesixty.review`` records
+        """
+        lines = self.filtered(lambda line: line.reviewer_id and line.reviewed_id)
+        if not lines:
+            return self.env['hr.threesixty.review']
+        reviews = self.env['hr.threesixty.review']._create_missing([
+            {
+                'plan_id': line.plan_id.id,
+                'allocation_id': line.allocation_id.id,
+                'review_list_id': line.id,
+                'reviewer_id': line.reviewer_id.id,
+                'reviewed_id': line.reviewed_id.id,
+                'department_id': line.reviewed_id.department_id.id,
+                'job_id': line.reviewed_id.job_id.id,
+                'manager_id': line.reviewed_id.parent_id.id,
+                'reviewer_user_id': line.reviewer_id.user_id.id,
+                'reviewed_user_id': line.reviewed_id.user_id.id,
+                'manager_user_id': line.reviewed_id.parent_id.user_id.id,
+            }
+            for line in lines
+        ])
+
+        # Link the reviews to the frozen questions of their plan
+        QuestionTemplate = self.env['hr.appraisal.question.template']
+        templates = {plan: QuestionTemplate._get_template(plan) for plan in reviews.plan_id}
+        self.env['hr.threesixty.review.question'].create([
+            {
+                'plan_id': review.plan_id.id,
+                'review_id': review.id,
+                'template_line_id': line.id,
+            }
+            for review in reviews
+            for line in templates[review.plan_id].line_ids
+        ])
+
+        lines.filtered(lambda line: line.state == 'new').write({'state': 'active'})
+        return reviews
 
-        else:
-            review = existing_review
+    def action_generate_review(self):
+        self.ensure_one()
+        if not self.reviewed_id:
+            raise UserError("Select the employee to be reviewed before generating the review.")
+        self._generate_reviews()
+        review = self.review_ids[:1]
 
         return {
             'type': 'ir.actions.act_window',
@@ -153,11 +214,12 @@ class ThreeSixtyReviewQuestion(models.Model):
     _description = "List of questions every employee under this plan must be asked"
 
 
-    plan_id = fields.Many2one('hr.threesixty.plan', string="360 Plan")
-    review_id = fields.Many2one('hr.threesixty.review', string="360 Review")
-    name = fields.Char(string="Question Title", required=True)
-    description = fields.Char(string="Description")
-    maximum_value = fields.Integer(string="Maximum Value")
+    plan_id = fields.Many2one('hr.threesixty.plan', string="360 Plan", index=True)
+    review_id = fields.Many2one('hr.threesixty.review', string="360 Review", index=True)
+    template_line_id = fields.Many2one('hr.appraisal.question.template.line', string="Template Question", ondelete='restrict', index=True)
+    name = fields.Char(related='template_line_id.name', string="Question Title")
+    description = fields.Char(related='template_line_id.description', string="Description")
+    maximum_value = fields.Integer(related='template_line_id.maximum_value', string="Maximum Value")
     reviewer_value = fields.Integer(string="Reviewer Score", default=0)
     reviewer_comment = fields.Char(string="Reviewer Comments")
 
@@ -166,5 +228,15 @@ class ThreeSixtyReviewQuestion(models.Model):
 
     _sql_constraints = [
         ('reviewer_value', 'CHECK(reviewer_value >= 0)','The employee value must be a positive value or 0.'),
-        ('reviewer_value', 'CHECK(maximum_value >= reviewer_value)', 'The employee score cant exceed the maximum.')
     ]
+
+    def init(self):
+        self.env['hr.appraisal.question.template']._freeze_legacy_questions(
+            self._table, 'threesixty_plan_id', "q.plan_id",
+        )
+
+    @api.constrains('reviewer_value', 'template_line_id')
+    def _check_maximum_value(self):
+        for question in self:
+            if question.reviewer_value > question.maximum_value:
+                raise ValidationError("The employee score cant exceed the maximum.")
@@ -0,0 +1,108 @@
+from odoo import models, fields, api
+
+from ..tools.profiling import timed
+
+
+class ThreeSixtyFeedbackSummary(models.Model):
+    _name = "hr.threesixty.feedback.summary"
+    _description = "360 Feedback Summary"
+    _order = "plan_id, reviewed_id, template_line_id, relationship"
+    _log_access = False
+
+    plan_id = fields.Many2one('hr.threesixty.plan', string="360 Plan", readonly=True, index=True, ondelete='cascade')
+    reviewed_id = fields.Many2one('hr.employee', string="Reviewed", readonly=True, index=True, ondelete='cascade')
+    template_line_id = fields.Many2one('hr.appraisal.question.template.line', string="Question", readonly=True, ondelete='cascade')
+    name = fields.Char(related='template_line_id.name', string="Question Title")
+    relationship = fields.Selection([
+        ('all', 'All Reviewers'),
+        ('manager', 'Manager'),
+        ('peer', 'Peer'),
+        ('report', 'Direct Report'),
+        ('other', 'Other'),
+    ], string="Reviewer Relationship", readonly=True,
+        help="Relationship of the reviewers to the reviewed employee; 'All Reviewers' sums up every relationship.")
+    review_count = fields.Integer(string="Reviews", readonly=True)
+    mean_value = fields.Float(string="Mean", readonly=True, group_operator='avg')
+    median_value = fields.Float(string="Median", readonly=True, group_operator='avg')
+    stddev_value = fields.Float(string="Standard Deviation", readonly=True, group_operator='avg')
+    min_value = fields.Integer(string="Minimum", readonly=True, group_operator='min')
+    max_value = fields.Integer(string="Maximum", readonly=True, group_operator='max')
+
+    _sql_constraints = [
+        ('summary_uniq', 'unique(plan_id, reviewed_id, template_line_id, relationship)',
+         'The feedback of an employee is summarized once per question and relationship.'),
+    ]
+
+    @api.model
+    @timed('refresh_feedback_summary')
+    def _refresh(self, plans, reviewed=None):
+        """ Recompute the summary rows of ``plans`` from their done reviews,
+        limited to the ``reviewed`` employees when given.
+
+        The statistics of every (reviewed, question, relationship) and the
+        'all' rows are computed in one aggregate query using grouping sets,
+        and upserted on the unique key of the summary, so that concurrent
+        refreshes of the same employee update the same rows. The rows left
+        without done reviews are deleted afterwards.
+        """
+        if not plans:
+            return
+        self.env['hr.threesixty.review'].flush_model(['plan_id', 'reviewer_id', 'reviewed_id', 'state'])
+        self.env['hr.threesixty.review.question'].flush_model(['review_id', 'template_line_id', 'reviewer_value'])
+        self.env['hr.employee'].flush_model(['parent_id', 'department_id'])
+
+        # Without a reviewed filter, every employee of the plans is refreshed
+        params = {
+            'plan_ids': plans.ids,
+            'reviewed_ids': reviewed.ids if reviewed else [],
+            'all_reviewed': not reviewed,
+        }
+        self.env.cr.execute("""
+            WITH answers AS (
+                SELECT review.plan_id,
+                       review.reviewed_id,
+                       question.template_line_id,
+                       question.reviewer_value AS value,
+                       CASE WHEN reviewed.parent_id = review.reviewer_id THEN 'manager'
+                            WHEN reviewer.parent_id = review.reviewed_id THEN 'report'
+                            WHEN reviewer.department_id = reviewed.department_id THEN 'peer'
+                            ELSE 'other'
+                       END AS relationship
+                  FROM hr_threesixty_review_question question
+                  JOIN hr_threesixty_review review ON review.id = question.review_id
+                  JOIN hr_employee reviewer ON reviewer.id = review.reviewer_id
+                  JOIN hr_employee reviewed ON reviewed.id = review.reviewed_id
+                 WHERE review.state = 'done'
+                   AND question.template_line_id IS NOT NULL
+                   AND review.plan_id = ANY(%(plan_ids)s)
+                   AND (%(all_reviewed)s OR review.reviewed_id = ANY(%(reviewed_ids)s))
+            )
+            INSERT INTO hr_threesixty_feedback_summary (
+                plan_id, reviewed_id, template_line_id, relationship, review_count,
+                mean_value, median_value, stddev_value, min_value, max_value
+            )
+            SELECT plan_id, reviewed_id, template_line_id, COALESCE(relationship, 'all'), COUNT(*),
+                   AVG(value), PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY value),
+                   COALESCE(STDDEV_SAMP(value), 0), MIN(value), MAX(value)
+              FROM answers
+          GROUP BY GROUPING SETS (
+                   (plan_id, reviewed_id, template_line_id, relationship),
+                   (plan_id, reviewed_id, template_line_id)
+                   )
+            ON CONFLICT (plan_id, reviewed_id, template_line_id, relationship) DO UPDATE
+               SET review_count = EXCLUDED.review_count,
+                   mean_value = EXCLUDED.mean_value,
+                   median_value = EXCLUDED.median_value,
+                   stddev_value = EXCLUDED.stddev_value,
+                   min_value = EXCLUDED.min_value,
+                   max_value = EXCLUDED.max_value
+         RETURNING id
+        """, params)
+        params['summary_ids'] = [id_ for id_, in self.env.cr.fetchall()]
+        self.env.cr.execute("""
+            DELETE FROM hr_threesixty_feedback_summary
+             WHERE plan_id = ANY(%(plan_ids)s)
+               AND (%(all_reviewed)s OR reviewed_id = ANY(%(reviewed_ids)s))
+               AND id != ALL(%(summary_ids)s)
+        """, params)
+        self.invalidate_model()
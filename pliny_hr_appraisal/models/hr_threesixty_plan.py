@@ -1,5 +1,11 @@
+from collections import Counter, defaultdict
+import heapq
+
 from odoo import models, fields, api, _
-from odoo.exceptions import ValidationError
+from odoo.exceptions import UserError, ValidationError
+
+from ..tools.concurrency import try_lock
+from ..tools.profiling import timed
 
 class ThreeSixtyPlan(models.Model):
     _name = "hr.threesixty.plan"
@@ -39,31 +45,225 @@ class ThreeSixtyPlan(models.Model):
         }
 
 
+    def action_export_results_xlsx(self):
+        return self._get_export_action('xlsx')
+
+    def action_export_results_csv(self):
+        return self._get_export_action('csv')
+
+    def _get_export_action(self, file_format):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/hr_appraisal/export/threesixty/{self.id}/{file_format}',
+            'target': 'self',
+        }
+
+    def action_generate_reviews(self):
+        self._lock_generation()
+        review_lists = self.allocation_ids.review_list_ids
+        reviews = review_lists._generate_reviews()
+        incomplete = review_lists.filtered(lambda line: not line.reviewed_id)
+
+        message = f"{len(reviews)} review(s) created."
+        if incomplete:
+            message += f" {len(incomplete)} line(s) without an employee to review were skipped."
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': "360 Review Generation",
+                'message': message,
+                'type': 'success' if reviews and not incomplete else 'warning',
+            }
+        }
+
+    def action_refresh_feedback_summary(self):
+        self.env['hr.threesixty.feedback.summary']._refresh(self)
+        return self.action_open_feedback_summary()
+
+    def action_open_feedback_summary(self):
+        return {
+            'type': 'ir.actions.act_window',
+            'name': "360 Feedback Summary",
+            'res_model': 'hr.threesixty.feedback.summary',
+            'view_mode': 'pivot,tree',
+            'domain': [('plan_id', 'in', self.ids)],
+            'context': {'search_default_all_reviewers': 1},
+        }
+
+    def action_assign_reviewers(self):
+        self._lock_generation()
+        review_lists = self.env['hr.threesixty.review.list']
+        shortfall = 0
+        for plan in self:
+            plan_review_lists, plan_shortfall = plan._assign_reviewers()
+            review_lists |= plan_review_lists
+            shortfall += plan_shortfall
+        review_lists._generate_reviews()
+
+        message = f"{len(review_lists)} review(s) assigned."
+        if shortfall:
+            message += f" {shortfall} reviewer(s) could not reach the minimum number of reviews."
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': "360 Reviewer Assignment",
+                'message': message,
+                'type': 'warning' if shortfall or not review_lists else 'success',
+            }
+        }
+
+    def _lock_generation(self):
+        """ Take the advisory locks of the plans for the transaction, so two
+        users cannot assign or generate the reviews of a plan at once. """
+        busy = self - try_lock(self)
+        if busy:
+            raise UserError(_("The reviews of %s are already being generated. Please try again once it is done.",
+                              ", ".join(busy.mapped('name'))))
+
+    @timed('assign_reviewers')
+    def _assign_reviewers(self):
+        """ Build the reviewer -> reviewee graph of the plan and create the
+        missing review lines in one batch.
+
+        Every allocated reviewer is given up to ``recommended_review``
+        colleagues to review (``minimum_review`` when no recommendation is
+        set), taken among the allocated employees in this order: their manager,
+        their direct reports, then the peers of their department. Within each
+        group, the colleagues with the fewest reviewers so far are picked
+        first, which spreads the reviews evenly over the reviewees. Existing
+        review lines are kept and count towards the targets.
+
+        The peers are taken from one heap per department, keyed on the number
+        of reviewers of each colleague, so a department of n employees costs
+        O(n log n) instead of ranking the whole department for every reviewer.
+
+        :return: the created review lines, and the number of reviewers left
+                 under ``minimum_review``
+        """
+        self.ensure_one()
+        target = max(self.minimum_review, self.recommended_review or 0)
+        if target <= 0:
+            raise UserError(_("Set the minimum or recommended number of reviews of the plan %s first.", self.name))
+
+        allocation_by_reviewer = {alloc.reviewer_id.id: alloc.id for alloc in self.allocation_ids}
+        employees = self.env['hr.employee'].browse(allocation_by_reviewer).read(['parent_id', 'department_id'], load=False)
+        manager = {employee['id']: employee['parent_id'] for employee in employees}
+        reports = defaultdict(list)
+        for employee in employees:
+            if employee['parent_id'] in allocation_by_reviewer:
+                reports[employee['parent_id']].append(employee['id'])
+        department = {employee['id']: employee['department_id'] for employee in employees}
+
+        pairs = {
+            (line.reviewer_id.id, line.reviewed_id.id)
+            for line in self.env['hr.threesixty.review.list'].search_fetch(
+                [('allocation_id', 'in', self.allocation_ids.ids)], ['reviewer_id', 'reviewed_id'])
+        }
+        given = Counter(reviewer for reviewer, _reviewed in pairs)
+        received = Counter(reviewed for _reviewer, reviewed in pairs)
+
+        # (received, employee) entries; an entry is stale once the employee
+        # was picked through their manager or reports, and is then refreshed
+        # when it reaches the top
+        peer_heaps = defaultdict(list)
+        for employee_id, department_id in department.items():
+            if department_id:
+                peer_heaps[department_id].append((received[employee_id], employee_id))
+        for heap in peer_heaps.values():
+            heapq.heapify(heap)
+
+        def pick_peers(reviewer, needed):
+            heap = peer_heaps[department[reviewer]]
+            picked, skipped = [], []
+            while heap and len(picked) < needed:
+                count, reviewed = heapq.heappop(heap)
+                if count != received[reviewed]:
+                    heapq.heappush(heap, (received[reviewed], reviewed))
+                elif reviewed == reviewer or (reviewer, reviewed) in pairs:
+                    skipped.append((count, reviewed))
+                else:
+                    picked.append(reviewed)
+            for entry in skipped:
+                heapq.heappush(heap, entry)
+            return picked
+
+        vals_list = []
+        shortfall = 0
+        for reviewer in sorted(allocation_by_reviewer):
+            needed = target - given[reviewer]
+            groups = (
+                [manager[reviewer]] if manager[reviewer] in allocation_by_reviewer else [],
+                reports[reviewer],
+            )
+            for group in groups:
+                if needed <= 0:
+                    break
+                candidates = [
+                    reviewed for reviewed in group
+                    if reviewed != reviewer and (reviewer, reviewed) not in pairs
+                ]
+                for reviewed in heapq.nsmallest(needed, candidates, key=lambda e: (received[e], e)):
+                    pairs.add((reviewer, reviewed))
+                    received[reviewed] += 1
+                    needed -= 1
+                    vals_list.append({
+                        'allocation_id': allocation_by_reviewer[reviewer],
+                        'reviewed_id': reviewed,
+                    })
+            if needed > 0 and department[reviewer]:
+                for reviewed in pick_peers(reviewer, needed):
+                    pairs.add((reviewer, reviewed))
+                    received[reviewed] += 1
+                    needed -= 1
+                    heapq.heappush(peer_heaps[department[reviewer]], (received[reviewed], reviewed))
+                    vals_list.append({
+                        'allocation_id': allocation_by_reviewer[reviewer],
+                        'reviewed_id': reviewed,
+                    })
+            if target - needed < self.minimum_review:
+                shortfall += 1
+
+        return self.env['hr.threesixty.review.list'].create(vals_list), shortfall
+
+
 class ThreeSixtyPlanAllocation(models.Model):
     _name = "hr.threesixty.plan.allocation"
     _description = "List of employees who should fill out this 360 plan Essential for email"
 
 
     plan_id = fields.Many2one('hr.threesixty.plan', string="360 Plan")
-    reviewer_id = fields.Many2one('hr.employee', string="Reviewer", required=True)
+    reviewer_id = fields.Many2one('hr.employee', string="Reviewer", required=True, index=True)
+    reviewer_user_id = fields.Many2one(related='reviewer_id.user_id', string="Reviewer User", store=True, index=True, precompute=True)
     number_of_reviews = fields.Integer(string="Number of Reviews",  compute="_compute_review_count", readonly = True)
     review_list_ids = fields.One2many('hr.threesixty.review.list', 'allocation_id', string="Reviews List")
     review_ids = fields.One2many('hr.threesixty.review', 'allocation_id', string="Reviews")
 
-    @api.depends('reviewer_id')
+    _sql_constraints = [
+        ('plan_reviewer_uniq', 'unique(plan_id, reviewer_id)', 'This employee is already allocated to this 360 plan.'),
+    ]
+
+    @api.depends('reviewer_id', 'plan_id')
     def _compute_review_count(self):
+        counts = {
+            (plan.id, reviewer.id): count
+            for plan, reviewer, count in self.env['hr.threesixty.review']._read_group(
+                [('plan_id', 'in', self.plan_id.ids), ('reviewer_id', 'in', self.reviewer_id.ids)],
+                ['plan_id', 'reviewer_id'],
+                ['__count'],
+            )
+        }
         for rec in self:
-            rec.number_of_reviews = self.env['hr.threesixty.review'].search_count([
-                ('reviewer_id', '=', rec.reviewer_id.id),
-                ('plan_id', '=', rec.plan_id.id),
-            ])
+            rec.number_of_reviews = counts.get((rec.plan_id.id, rec.reviewer_id.id), 0)
 
 class ThreeSixtyPlanQuestion(models.Model):
     _name = "hr.threesixty.plan.question"
     _description = "List of questions every employee under this plan must be asked"
 
 
-    plan_id = fields.Many2one('hr.threesixty.plan', string="360 Plan")
+    plan_id = fields.Many2one('hr.threesixty.plan', string="360 Plan", index=True)
     name = fields.Char(string="Question", required=True)
     description = fields.Char(string="Description")
     score_id = fields.Many2one('hr.appraisal.score', related="plan_id.score_id", string="Scoring System", readonly=True)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+""" Dispatch of the appraisal emails against a local SMTP server, to check
+which notifications are marked sent, retried or left queued. """
+import socket
+import unittest
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+from odoo.addons.hr_appraisal.models.hr_appraisal_notification import HELD_MAIL_DATE
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    Controller = None
+
+REJECTED = 'rejected@example.com'
+
+
+class SmtpHandler:
+    """ Collects the messages received and refuses the ``REJECTED`` address. """
+
+    def __init__(self):
+        self.recipients = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == REJECTED:
+            return '550 Mailbox unavailable'
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        self.recipients += envelope.rcpt_tos
+        return '250 OK'
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@unittest.skipUnless(Controller, "aiosmtpd is not installed")
+@tagged('post_install', '-at_install')
+class TestNotificationDispatch(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.handler = SmtpHandler()
+        cls.controller = Controller(cls.handler, hostname='127.0.0.1', port=_free_port())
+        cls.controller.start()
+        cls.addClassCleanup(cls.controller.stop)
+        cls.mail_server = cls.env['ir.mail_server'].create({
+            'name': "Local SMTP",
+            'smtp_host': '127.0.0.1',
+            'smtp_port': cls.controller.port,
+            'smtp_encryption': 'none',
+        })
+        # The test mode skips the SMTP connection altogether
+        cls.startClassPatcher(patch.object(type(cls.env['ir.mail_server']), '_is_test_mode', lambda self: False))
+
+    def setUp(self):
+        super().setUp()
+        self.handler.recipients.clear()
+        self.Notification = self.env['hr.appraisal.notification']
+        self.env['ir.config_parameter'].sudo().set_param('hr_appraisal.notification_mail_limit', 0)
+
+    def _enqueue_mails(self, recipients, auto_delete=False):
+        mails = self.env['mail.mail'].create([{
+            'subject': "Appraisal",
+            'body_html': "<p>Your appraisal is ready</p>",
+            'email_from': 'hr@example.com',
+            'email_to': recipient,
+            'mail_server_id': self.mail_server.id,
+            'auto_delete': auto_delete,
+            'scheduled_date': HELD_MAIL_DATE,
+        } for recipient in recipients])
+        return self.Notification._enqueue([
+            {'notification_type': 'mail', 'mail_id': mail.id} for mail in mails
+        ])
+
+    def test_dispatch_states(self):
+        kept = self._enqueue_mails(['kept@example.com'])
+        deleted = self._enqueue_mails(['deleted@example.com'], auto_delete=True)
+        rejected = self._enqueue_mails([REJECTED])
+
+        self.Notification._cron_dispatch()
+
+        self.assertCountEqual(self.handler.recipients, ['kept@example.com', 'deleted@example.com'])
+        self.assertEqual(kept.state, 'sent')
+        self.assertEqual(deleted.state, 'sent')
+        self.assertEqual(rejected.state, 'pending')
+        self.assertEqual(rejected.attempt_count, 1)
+
+    def test_dispatch_keeps_outgoing_mails_queued(self):
+        notification = self._enqueue_mails(['later@example.com'])
+        # The mails stay outgoing when the server cannot be reached
+        with patch.object(type(self.env['mail.mail']), 'send', lambda self, **kwargs: True):
+            self.Notification._cron_dispatch()
+
+        self.assertEqual(notification.mail_id.state, 'outgoing')
+        self.assertEqual(notification.mail_id.scheduled_date, HELD_MAIL_DATE)
+        self.assertEqual(notification.state, 'pending')
+        self.assertEqual(notification.attempt_count, 0)
+
+    def test_standard_queue_skips_queued_mails(self):
+        notification = self._enqueue_mails(['queued@example.com'])
+        self.env['mail.mail'].process_email_queue()
+        self.assertFalse(self.handler.recipients)
+        self.assertEqual(notification.mail_id.state, 'outgoing')
+
+        self.Notification._cron_dispatch()
+        self.assertEqual(self.handler.recipients, ['queued@example.com'])
+        self.assertEqual(notification.state, 'sent')
+
+    def test_dispatch_mail_limit(self):
+        self.env['ir.config_parameter'].sudo().set_param('hr_appraisal.notification_mail_limit', 2)
+        notifications = self._enqueue_mails([f'employee{i}@example.com' for i in range(5)])
+
+        self.Notification._cron_dispatch()
+        self.assertEqual(len(self.handler.recipients), 2)
+        self.assertEqual(notifications.mapped('state'), ['sent'] * 2 + ['pending'] * 3)
+
+        self.Notification._cron_dispatch()
+        self.Notification._cron_dispatch()
+        self.assertEqual(len(self.handler.recipients), 5)
+        self.assertEqual(set(notifications.mapped('state')), {'sent'})
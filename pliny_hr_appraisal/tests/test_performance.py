@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import base64
+import csv
+import io
+
+from odoo import Command, fields
+from odoo.tests import tagged
+from odoo.tools import date_utils
+from odoo.addons.base_perf_tools.tests.common import QueryCountCase
+from odoo.addons.base_perf_tools.tools.benchmark import create_employees
+
+QUESTIONS = 5
+
+
+@tagged('post_install', '-at_install')
+class TestPerformance(QueryCountCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.score = cls.env['hr.appraisal.score'].create({'name': "Perf Score", 'maximum_value': 5})
+
+    def _create_employees(self, size):
+        # As many departments at every size, so only their headcount grows
+        return create_employees(self.env, size, prefix=f"Perf {size}", department_size=size // 4)
+
+    def _create_appraisal_plan(self, size):
+        return self.env['hr.appraisal.plan'].create({
+            'name': f"Perf Plan {size}",
+            'score_id': self.score.id,
+            'deadline': date_utils.add(fields.Date.today(), months=1),
+            'question_ids': [Command.create({'name': f"Question {index}"}) for index in range(QUESTIONS)],
+            'allocation_ids': [Command.create({'employee_id': employee.id}) for employee in self._create_employees(size)],
+        })
+
+    def _create_threesixty_plan(self, size, reviews=3, questions=QUESTIONS, employees=None):
+        employees = self._create_employees(size) if employees is None else employees
+        return self.env['hr.threesixty.plan'].create({
+            'name': f"Perf 360 Plan {size}",
+            'score_id': self.score.id,
+            'minimum_review': reviews,
+            'recommended_review': reviews,
+            'question_ids': [Command.create({'name': f"Question {index}"}) for index in range(questions)],
+            'allocation_ids': [Command.create({'reviewer_id': employee.id}) for employee in employees],
+        })
+
+    def test_generate_appraisals(self):
+        plans = self.assertStableQueryCount(80, self._create_appraisal_plan, lambda plan: plan.action_generate_appraisals())
+        for size, plan in plans.items():
+            self.assertEqual(len(plan.appraisal_ids), size)
+            self.assertEqual(len(plan.appraisal_ids.question_ids), size * QUESTIONS)
+            self.assertEqual(set(plan.allocation_ids.mapped('state')), {'allocated'})
+
+    def test_add_appraisal_employees(self):
+        def setup(size):
+            employees = self._create_employees(size)
+            plan = self.env['hr.appraisal.plan'].create({'name': f"Perf Plan {size}"})
+            return self.env['hr.appraisal.add.employees.wizard'].create({
+                'plan_id': plan.id,
+                'department_ids': [Command.set(employees.department_id.ids)],
+            })
+
+        wizards = self.assertStableQueryCount(20, setup, lambda wizard: wizard.action_add_appraisal_employees())
+        for size, wizard in wizards.items():
+            self.assertEqual(len(wizard.plan_id.allocation_ids), size)
+
+    def test_add_threesixty_employees(self):
+        def setup(size):
+            employees = self._create_employees(size)
+            plan = self.env['hr.threesixty.plan'].create({'name': f"Perf 360 Plan {size}"})
+            return self.env['hr.threesixty.add.employees.wizard'].create({
+                'plan_id': plan.id,
+                'department_ids': [Command.set(employees.department_id.ids)],
+            })
+
+        wizards = self.assertStableQueryCount(20, setup, lambda wizard: wizard.action_add_employees())
+        for size, wizard in wizards.items():
+            self.assertEqual(len(wizard.plan_id.allocation_ids), size)
+
+    def test_assign_reviewers(self):
+        plans = self.assertStableQueryCount(80, self._create_threesixty_plan, lambda plan: plan.action_assign_reviewers())
+        for size, plan in plans.items():
+            review_lists = plan.allocation_ids.review_list_ids
+            self.assertEqual(len(review_lists), size * 3)
+            self.assertEqual(len(review_lists.review_ids), size * 3)
+
+    def test_generate_review(self):
+        # The size is the number of questions of the review
+        employees = create_employees(self.env, 2, prefix="Perf Review")
+
+        def setup(size):
+            plan = self._create_threesixty_plan(size, questions=size, employees=employees[:1])
+            return self.env['hr.threesixty.review.list'].create({
+                'allocation_id': plan.allocation_ids.id,
+                'reviewed_id': employees[1].id,
+            })
+
+        review_lists = self.assertStableQueryCount(25, setup, lambda review_list: review_list.action_generate_review())
+        for size, review_list in review_lists.items():
+            self.assertEqual(len(review_list.review_ids), 1)
+            self.assertEqual(len(review_list.review_ids.question_ids), size)
+
+    def test_review_count(self):
+        def setup(size):
+            plan = self._create_threesixty_plan(size)
+            plan.action_assign_reviewers()
+            return plan.allocation_ids
+
+        allocations = self.assertStableQueryCount(4, setup, lambda allocations: allocations.mapped('number_of_reviews'))
+        for allocation in allocations.values():
+            self.assertEqual(set(allocation.mapped('number_of_reviews')), {3})
+
+    def test_score_compute(self):
+        def setup(size):
+            plan = self._create_appraisal_plan(size)
+            return plan.allocation_ids._generate_appraisals().question_ids
+
+        questions = self.assertStableQueryCount(25, setup, lambda questions: questions.write({'employee_value': 3, 'manager_value': 4}))
+        for question in questions.values():
+            appraisals = question.appraisal_id
+            self.assertEqual(set(appraisals.mapped('total_employee_score')), {3 * QUESTIONS})
+            self.assertEqual(set(appraisals.mapped('employee_score_percentage')), {60.0})
+            self.assertEqual(set(appraisals.mapped('manager_score_percentage')), {80.0})
+
+    def test_score_compute_dependencies(self):
+        plan = self._create_appraisal_plan(20)
+        appraisals = plan.allocation_ids._generate_appraisals()
+        appraisals.question_ids.write({'employee_value': 3})
+        self.env.flush_all()
+        Appraisal = self.env['hr.appraisal']
+        appraisals.question_ids.write({'manager_value': 4})
+        self.assertFalse(self.env.records_to_compute(Appraisal._fields['total_employee_score']))
+        self.assertEqual(self.env.records_to_compute(Appraisal._fields['total_manager_score']), appraisals)
+        with self.assertQueryCount(5):
+            self.env.flush_all()
+        self.assertEqual(set(appraisals.mapped('employee_score_percentage')), {60.0})
+        self.assertEqual(set(appraisals.mapped('manager_score_percentage')), {80.0})
+
+    def test_feedback_summary(self):
+        Summary = self.env['hr.threesixty.feedback.summary']
+
+        def setup(size):
+            plan = self._create_threesixty_plan(size)
+            plan.action_assign_reviewers()
+            # Answer every review in SQL, as the benchmark does
+            self.env.flush_all()
+            self.env.cr.execute("UPDATE hr_threesixty_review SET state = 'done' WHERE plan_id = %s", [plan.id])
+            self.env.cr.execute("""
+                UPDATE hr_threesixty_review_question SET reviewer_value = id %% 6 WHERE plan_id = %s
+            """, [plan.id])
+            return plan
+
+        plans = self.assertStableQueryCount(10, setup, Summary._refresh)
+        totals = {}
+        for size, plan in plans.items():
+            totals[size] = Summary.search([('plan_id', '=', plan.id), ('relationship', '=', 'all')])
+            self.assertEqual(sum(totals[size].mapped('review_count')), size * 3 * QUESTIONS)
+
+        # A second refresh updates the same rows
+        self.assertStableQueryCount(10, plans.get, Summary._refresh)
+        for size, plan in plans.items():
+            self.assertEqual(Summary.search([('plan_id', '=', plan.id), ('relationship', '=', 'all')]), totals[size])
+
+    def test_import_appraisals(self):
+        def setup(size):
+            plan = self.env['hr.appraisal.plan'].create({'name': f"Perf History Plan {size}", 'score_id': self.score.id})
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(['employee', 'plan', 'state', 'deadline', 'question', 'maximum_value', 'employee_value', 'manager_value'])
+            for employee in self._create_employees(size):
+                for index in range(QUESTIONS):
+                    writer.writerow([employee.name, plan.name, 'done', '2021-12-31', f"Question {index}", 5, 3, 4])
+            return self.env['hr.appraisal.import.wizard'].create({
+                'data_file': base64.b64encode(buffer.getvalue().encode()),
+                'filename': 'history.csv',
+            })
+
+        wizards = self.assertStableQueryCount(80, setup, lambda wizard: wizard.action_import())
+        for size in wizards:
+            appraisals = self.env['hr.appraisal'].search([('plan_id.name', '=', f"Perf History Plan {size}")])
+            self.assertEqual(len(appraisals), size)
+            self.assertEqual(set(appraisals.mapped('manager_score_percentage')), {80.0})
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import Command, fields
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import date_utils
+from odoo.addons.base_perf_tools.tools.explain import check_query_plans
+
+
+@tagged('post_install', '-at_install')
+class TestQueryPlans(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        department = cls.env['hr.department'].create({'name': "Plans Department"})
+        manager = cls.env['hr.employee'].create({'name': "Plans Manager", 'department_id': department.id})
+        employees = manager + cls.env['hr.employee'].create([
+            {'name': f"Plans Employee {index}", 'department_id': department.id, 'parent_id': manager.id}
+            for index in range(5)
+        ])
+        score = cls.env['hr.appraisal.score'].create({'name': "Plans Score", 'maximum_value': 5})
+        plan = cls.env['hr.appraisal.plan'].create({
+            'name': "Plans Appraisal Plan",
+            'score_id': score.id,
+            'deadline': date_utils.add(fields.Date.today(), months=1),
+            'question_ids': [Command.create({'name': "Question"})],
+            'allocation_ids': [Command.create({'employee_id': employee.id}) for employee in employees],
+        })
+        plan.action_generate_appraisals()
+        threesixty_plan = cls.env['hr.threesixty.plan'].create({
+            'name': "Plans 360 Plan",
+            'score_id': score.id,
+            'minimum_review': 2,
+            'recommended_review': 3,
+            'question_ids': [Command.create({'name': "Question"})],
+            'allocation_ids': [Command.create({'reviewer_id': employee.id}) for employee in employees],
+        })
+        threesixty_plan.action_assign_reviewers()
+
+    def test_query_shapes_use_indexes(self):
+        self.assertEqual(check_query_plans(self.env, 'hr_appraisal'), {})
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+""" Benchmarks of the hot paths of the appraisal module, run by
+``base_perf_tools.tools.benchmark.run_suite``. """
+import base64
+import csv
+import io
+
+from odoo import Command, fields
+from odoo.tools import date_utils
+from odoo.addons.base_perf_tools.tools.benchmark import create_employees, measure
+
+
+def bench_generate_appraisals(env, employees=1000, questions=10):
+    """ Time ``hr.appraisal.plan.action_generate_appraisals`` on a plan
+    allocated to ``employees`` new employees with ``questions`` questions. """
+    staff = create_employees(env, employees)
+    score = env['hr.appraisal.score'].create({'name': "Bench Score", 'maximum_value': 5})
+    plan = env['hr.appraisal.plan'].create({
+        'name': "Bench Plan",
+        'score_id': score.id,
+        'deadline': date_utils.add(fields.Date.today(), months=1),
+        'question_ids': [Command.create({'name': f"Question {index}"}) for index in range(questions)],
+        'allocation_ids': [Command.create({'employee_id': employee.id}) for employee in staff],
+    })
+    return measure(env, 'generate_appraisals', plan.action_generate_appraisals, len(staff))
+
+
+def bench_assign_reviewers(env, employees=5000, minimum=3, recommended=5, questions=10,
+                           department_size=50, label='assign_reviewers'):
+    """ Time ``hr.threesixty.plan.action_assign_reviewers`` (graph building plus
+    review lines, reviews and questions creation) on ``employees`` new
+    employees, in departments of ``department_size`` people. """
+    staff = create_employees(env, employees, department_size=department_size)
+    score = env['hr.appraisal.score'].create({'name': "Bench Score", 'maximum_value': 5})
+    plan = env['hr.threesixty.plan'].create({
+        'name': "Bench 360 Plan",
+        'score_id': score.id,
+        'minimum_review': minimum,
+        'recommended_review': recommended,
+        'question_ids': [Command.create({'name': f"Question {index}"}) for index in range(questions)],
+        'allocation_ids': [Command.create({'reviewer_id': employee.id}) for employee in staff],
+    })
+    return measure(env, label, plan.action_assign_reviewers, len(staff))
+
+
+def bench_assign_reviewers_one_department(env, employees=5000, **kwargs):
+    """ ``bench_assign_reviewers`` with every employee in one department, where
+    the peers make up nearly all the reviews. """
+    return bench_assign_reviewers(env, employees=employees, department_size=employees,
+                                  label='assign_reviewers_one_department', **kwargs)
+
+
+def bench_score_compute(env, appraisals=10000, questions=10):
+    """ Time the recomputation of the appraisal scores after every employee
+    and manager score of ``appraisals`` x ``questions`` question rows is
+    written at once. """
+    staff = create_employees(env, appraisals)
+    score = env['hr.appraisal.score'].create({'name': "Bench Score", 'maximum_value': 5})
+    plan = env['hr.appraisal.plan'].create({
+        'name': "Bench Plan",
+        'score_id': score.id,
+        'deadline': date_utils.add(fields.Date.today(), months=1),
+        'question_ids': [Command.create({'name': f"Question {index}"}) for index in range(questions)],
+        'allocation_ids': [Command.create({'employee_id': employee.id}) for employee in staff],
+    })
+    question_rows = plan.allocation_ids._generate_appraisals().question_ids
+    return measure(
+        env, 'score_compute',
+        lambda: question_rows.write({'employee_value': 3, 'manager_value': 4}),
+        len(question_rows),
+    )
+
+
+def bench_feedback_summary(env, reviewees=5000, reviewers=8, questions=30):
+    """ Time the 360 feedback summary of a plan where each of ``reviewees``
+    employees received ``reviewers`` done reviews of ``questions`` questions. """
+    staff = create_employees(env, reviewees)
+    score = env['hr.appraisal.score'].create({'name': "Bench Score", 'maximum_value': 5})
+    plan = env['hr.threesixty.plan'].create({
+        'name': "Bench 360 Plan",
+        'score_id': score.id,
+        'minimum_review': reviewers,
+        'recommended_review': reviewers,
+        'question_ids': [Command.create({'name': f"Question {index}"}) for index in range(questions)],
+        'allocation_ids': [Command.create({'reviewer_id': employee.id}) for employee in staff],
+    })
+    plan.action_assign_reviewers()
+    # Fill the answers in SQL, the ORM would dominate the setup time
+    env.flush_all()
+    env.cr.execute("UPDATE hr_threesixty_review SET state = 'done' WHERE plan_id = %s", [plan.id])
+    env.cr.execute("""
+        UPDATE hr_threesixty_review_question SET reviewer_value = id %% 6 WHERE plan_id = %s
+    """, [plan.id])
+    env.cr.execute("SELECT COUNT(*) FROM hr_threesixty_review_question WHERE plan_id = %s", [plan.id])
+    answers = env.cr.fetchone()[0]
+    return measure(
+        env, 'feedback_summary',
+        lambda: env['hr.threesixty.feedback.summary']._refresh(plan),
+        answers,
+    )
+
+
+def bench_import_appraisals(env, appraisals=1000, questions=30):
+    """ Time the import of a generated CSV file of ``appraisals`` x
+    ``questions`` answers through ``hr.appraisal.import.wizard``. """
+    staff = create_employees(env, appraisals)
+    score = env['hr.appraisal.score'].create({'name': "Bench Score", 'maximum_value': 5})
+    plan = env['hr.appraisal.plan'].create({'name': "Bench History Plan", 'score_id': score.id})
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(['employee', 'plan', 'state', 'deadline', 'question', 'maximum_value', 'employee_value', 'manager_value'])
+    for employee in staff:
+        for index in range(questions):
+            writer.writerow([employee.name, plan.name, 'done', '2021-12-31', f"Question {index}", 5, index % 6, (index + 1) % 6])
+    wizard = env['hr.appraisal.import.wizard'].create({
+        'data_file': base64.b64encode(buffer.getvalue().encode()),
+        'filename': 'history.csv',
+    })
+    return measure(env, 'import_appraisals', wizard.action_import, len(staff) * questions)
+
+
+def bench_add_appraisal_employees(env, employees=1000):
+    """ Time the Add Employees wizard of an appraisal plan adding every
+    employee of ``employees`` new employees' departments. """
+    staff = create_employees(env, employees)
+    plan = env['hr.appraisal.plan'].create({
+        'name': "Bench Plan",
+        'deadline': date_utils.add(fields.Date.today(), months=1),
+    })
+    wizard = env['hr.appraisal.add.employees.wizard'].create({
+        'plan_id': plan.id,
+        'department_ids': [Command.set(staff.department_id.ids)],
+    })
+    return measure(env, 'add_appraisal_employees', wizard.action_add_appraisal_employees, len(staff))
+
+
+def bench_add_threesixty_employees(env, employees=1000):
+    """ Time the Add Employees wizard of a 360 plan adding every employee of
+    ``employees`` new employees' departments. """
+    staff = create_employees(env, employees)
+    plan = env['hr.threesixty.plan'].create({'name': "Bench 360 Plan"})
+    wizard = env['hr.threesixty.add.employees.wizard'].create({
+        'plan_id': plan.id,
+        'department_ids': [Command.set(staff.department_id.ids)],
+    })
+    return measure(env, 'add_threesixty_employees', wizard.action_add_employees, len(staff))
+
+
+def bench_generate_reviews(env, employees=1000, reviews=5, questions=10):
+    """ Time the creation of the reviews and their questions for the review
+    lines of ``employees`` reviewers, as ``action_generate_review`` and the
+    plan's Generate All Reviews button do. """
+    staff = create_employees(env, employees)
+    score = env['hr.appraisal.score'].create({'name': "Bench Score", 'maximum_value': 5})
+    plan = env['hr.threesixty.plan'].create({
+        'name': "Bench 360 Plan",
+        'score_id': score.id,
+        'minimum_review': reviews,
+        'recommended_review': reviews,
+        'question_ids': [Command.create({'name': f"Question {index}"}) for index in range(questions)],
+        'allocation_ids': [Command.create({'reviewer_id': employee.id}) for employee in staff],
+    })
+    review_lists, _shortfall = plan._assign_reviewers()
+    return measure(env, 'generate_reviews', review_lists._generate_reviews, len(review_lists))
+
+
+def bench_review_count(env, employees=1000, reviews=5):
+    """ Read ``number_of_reviews`` on the allocations of ``employees``
+    reviewers, as the plan form does. """
+    staff = create_employees(env, employees)
+    plan = env['hr.threesixty.plan'].create({
+        'name': "Bench 360 Plan",
+        'minimum_review': reviews,
+        'recommended_review': reviews,
+        'allocation_ids': [Command.create({'reviewer_id': employee.id}) for employee in staff],
+    })
+    plan.action_assign_reviewers()
+    return measure(env, 'review_count', lambda: plan.allocation_ids.mapped('number_of_reviews'), len(staff))
+
+
+# (benchmark, keyword argument set to the scale, other arguments)
+SUITE = [
+    (bench_generate_appraisals, 'employees', {}),
+    (bench_add_appraisal_employees, 'employees', {}),
+    (bench_add_threesixty_employees, 'employees', {}),
+    (bench_assign_reviewers, 'employees', {}),
+    (bench_assign_reviewers_one_department, 'employees', {}),
+    (bench_generate_reviews, 'employees', {}),
+    (bench_review_count, 'employees', {}),
+    (bench_score_compute, 'appraisals', {}),
+    (bench_feedback_summary, 'reviewees', {'questions': 10}),
+    (bench_import_appraisals, 'appraisals', {'questions': 10}),
+]
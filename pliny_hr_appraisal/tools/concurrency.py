@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+""" Helpers making the generation of appraisals and reviews safe to run from
+several transactions at once: per-record advisory locks, row claims that
+skip the rows locked by another transaction, and bulk inserts that skip
+the rows another transaction created first. """
+from psycopg2.errors import SerializationFailure
+
+from odoo.tools import split_every
+
+# Rows per INSERT statement
+INSERT_PAGE_SIZE = 1000
+
+
+def try_lock(records):
+    """ Take the transaction-level advisory lock of each of ``records``,
+    keyed on their table and id, without waiting.
+
+    :return: the records locked; the others are locked by a concurrent
+             transaction. The locks are released at commit or rollback.
+    """
+    if not records:
+        return records
+    records.env.cr.execute("""
+        SELECT id FROM unnest(%s::integer[]) AS id
+         WHERE pg_try_advisory_xact_lock(%s::regclass::oid::integer, id)
+    """, [list(records.ids), records._table])
+    return records.browse([id_ for id_, in records.env.cr.fetchall()])
+
+
+def claim_rows(model, query, params):
+    """ Run ``query``, a ``SELECT id ... FOR UPDATE SKIP LOCKED`` on the table
+    of ``model``, in a savepoint.
+
+    The rows locked by a concurrent transaction are skipped; a row updated
+    by a transaction committed since the snapshot cannot be locked under
+    REPEATABLE READ, in which case the caller should commit and try again
+    with a fresh snapshot.
+
+    :return: the records locked until commit, or ``None`` on a conflict
+    """
+    cr = model.env.cr
+    try:
+        with cr.savepoint(flush=False):
+            cr.execute(query, params)
+            ids = [id_ for id_, in cr.fetchall()]
+    except SerializationFailure:
+        return None
+    return model.browse(ids)
+
+
+def insert_missing(model, vals_list, conflict):
+    """ Insert ``vals_list`` into the table of ``model`` with one statement
+    per page, skipping the rows that conflict on the unique columns
+    ``conflict`` instead of failing.
+
+    This bypasses ``create``: the values must include the stored related
+    fields, the other stored computed fields are queued for recomputation,
+    and the caller applies the side effects of its ``create`` override. A
+    conflict with a row the transaction cannot see yet raises a
+    serialization failure, which Odoo retries.
+
+    :return: the inserted records
+    """
+    if not vals_list:
+        return model.browse()
+    model.check_access_rights('create')
+    env = model.env
+    vals_list = [model._add_missing_default_values(vals) for vals in vals_list]
+    columns = [
+        field for field in model._fields.values()
+        if field.store and field.column_type and any(field.name in vals for vals in vals_list)
+        and field.name not in ('id', 'create_uid', 'create_date', 'write_uid', 'write_date')
+    ]
+    now = env.cr.now()
+    rows = [
+        tuple(field.convert_to_column(vals.get(field.name), model, vals) for field in columns)
+        + (env.uid, now, env.uid, now)
+        for vals in vals_list
+    ]
+    column_names = ", ".join(f'"{field.name}"' for field in columns)
+    ids = []
+    for page in split_every(INSERT_PAGE_SIZE, rows):
+        # Each row tuple is adapted to a parenthesised list of values
+        env.cr.execute(f"""
+            INSERT INTO "{model._table}" ({column_names}, create_uid, create_date, write_uid, write_date)
+            VALUES {", ".join(["%s"] * len(page))}
+            ON CONFLICT ({", ".join(conflict)}) DO NOTHING
+            RETURNING id
+        """, page)
+        ids += [id_ for id_, in env.cr.fetchall()]
+    records = model.browse(ids)
+
+    # The one2many fields listing the new rows are stale
+    for field in columns:
+        if field.type != 'many2one':
+            continue
+        comodel = env[field.comodel_name]
+        inverses = [
+            inverse.name for inverse in comodel._fields.values()
+            if inverse.type == 'one2many' and inverse.comodel_name == model._name
+            and inverse.inverse_name == field.name
+        ]
+        if inverses:
+            comodel.invalidate_model(inverses)
+    inserted = {field.name for field in columns}
+    for field in model._fields.values():
+        if field.store and field.compute and field.name not in inserted:
+            env.add_to_compute(field, records)
+    return records
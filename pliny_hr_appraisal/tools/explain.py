@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+""" Lookups of the appraisal module and its record rules, checked by
+``base_perf_tools.tools.explain.check_query_plans``. """
+
+QUERY_SHAPES = {
+    'appraisal_by_plan_employee': (
+        "SELECT id FROM hr_appraisal WHERE plan_id = %s AND employee_id = %s",
+        [0, 0],
+    ),
+    'appraisal_by_plan_state': (
+        "SELECT id FROM hr_appraisal WHERE plan_id = %s AND state = 'manager_review'",
+        [0],
+    ),
+    'appraisal_by_employee_user': (
+        "SELECT id FROM hr_appraisal WHERE employee_user_id = %s OR manager_user_id = %s",
+        [0, 0],
+    ),
+    'appraisal_by_manager': (
+        "SELECT id FROM hr_appraisal WHERE manager_id = %s",
+        [0],
+    ),
+    'appraisal_open_deadline': (
+        "SELECT id FROM hr_appraisal WHERE state IN ('draft', 'submitted') AND deadline <= %s",
+        ['2000-01-01'],
+    ),
+    'appraisal_question_by_appraisal': (
+        "SELECT id FROM hr_appraisal_question WHERE appraisal_id = %s",
+        [0],
+    ),
+    'allocation_draft_by_plan': (
+        "SELECT id FROM hr_appraisal_plan_allocation WHERE plan_id = %s AND state = 'draft' ORDER BY id LIMIT 500",
+        [0],
+    ),
+    'allocation_by_employee': (
+        "SELECT id FROM hr_appraisal_plan_allocation WHERE employee_id = %s",
+        [0],
+    ),
+    'review_by_review_list': (
+        "SELECT id FROM hr_threesixty_review WHERE review_list_id = %s",
+        [0],
+    ),
+    'review_by_list_participants': (
+        "SELECT id FROM hr_threesixty_review WHERE review_list_id = %s AND reviewer_id = %s AND reviewed_id = %s AND plan_id = %s",
+        [0, 0, 0, 0],
+    ),
+    'review_by_reviewer': (
+        "SELECT id FROM hr_threesixty_review WHERE reviewer_id = %s",
+        [0],
+    ),
+    'review_by_user': (
+        "SELECT id FROM hr_threesixty_review WHERE reviewer_user_id = %s OR reviewed_user_id = %s",
+        [0, 0],
+    ),
+    'review_by_reviewed': (
+        "SELECT id FROM hr_threesixty_review WHERE reviewed_id = %s",
+        [0],
+    ),
+    'review_draft_by_plan': (
+        "SELECT id FROM hr_threesixty_review WHERE plan_id = %s AND state = 'draft'",
+        [0],
+    ),
+    'review_question_by_review': (
+        "SELECT id FROM hr_threesixty_review_question WHERE review_id = %s",
+        [0],
+    ),
+    'review_list_by_allocation': (
+        "SELECT id FROM hr_threesixty_review_list WHERE allocation_id = %s",
+        [0],
+    ),
+    'review_list_by_reviewer_user': (
+        "SELECT id FROM hr_threesixty_review_list WHERE reviewer_user_id = %s",
+        [0],
+    ),
+    'threesixty_allocation_by_plan': (
+        "SELECT id FROM hr_threesixty_plan_allocation WHERE plan_id = %s",
+        [0],
+    ),
+    'threesixty_allocation_by_reviewer_user': (
+        "SELECT id FROM hr_threesixty_plan_allocation WHERE reviewer_user_id = %s",
+        [0],
+    ),
+    'analysis_by_deadline_department': (
+        "SELECT id FROM hr_appraisal_analysis WHERE deadline >= %s AND department_id = %s",
+        ['2000-01-01', 0],
+    ),
+}
+
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+""" Lightweight timing of the hot paths of the appraisal module.
+
+``PhaseTimer`` sums the wall time and queries spent in the phases of one run
+and logs a single summary line at the end; ``timed`` logs the same figures
+for one method call at DEBUG level::
+
+    with PhaseTimer(self.env, 'generate_appraisals', _logger) as timer:
+        with timer.phase('db'):
+            ...
+        timer.count(created=len(appraisals))
+
+    @timed('generate_reviews')
+    def _generate_reviews(self):
+        ...
+"""
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+import functools
+import logging
+import time
+
+_logger = logging.getLogger(__name__)
+
+
+class PhaseTimer:
+    """ Wall time and query count of a run, split by phase, plus free-form
+    counters, logged as one ``key=value`` line when the run ends. """
+
+    def __init__(self, env, name, logger=_logger, level=logging.INFO):
+        self.env = env
+        self.name = name
+        self.logger = logger
+        self.level = level
+        self.counters = Counter()
+        self.phases = defaultdict(lambda: {'seconds': 0.0, 'queries': 0})
+        self._start = None
+        self._queries = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self._queries = self.env.cr.sql_log_count
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.seconds = time.perf_counter() - self._start
+        self.queries = self.env.cr.sql_log_count - self._queries
+        if exc_type is None:
+            self.log_summary()
+
+    @contextmanager
+    def phase(self, name):
+        """ Add the time and queries spent in the block to phase ``name``;
+        a phase may be entered several times per run. """
+        start = time.perf_counter()
+        queries = self.env.cr.sql_log_count
+        try:
+            yield
+        finally:
+            self.phases[name]['seconds'] += time.perf_counter() - start
+            self.phases[name]['queries'] += self.env.cr.sql_log_count - queries
+
+    def count(self, **counters):
+        self.counters.update(counters)
+
+    def summary(self):
+        return {
+            'seconds': round(self.seconds, 3),
+            'queries': self.queries,
+            **self.counters,
+            **{
+                f'{phase}_{key}': round(value, 3) if key == 'seconds' else value
+                for phase, totals in self.phases.items()
+                for key, value in totals.items()
+            },
+        }
+
+    def log_summary(self):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s: %s", self.name, " ".join(
+                f"{key}={value}" for key, value in self.summary().items()
+            ))
+
+
+def timed(name, level=logging.DEBUG):
+    """ Decorate a model method to log the wall time and queries of each
+    call at ``level`` on the logger of the method's module. Nothing is
+    measured while that level is disabled. """
+    def decorator(method):
+        logger = logging.getLogger(method.__module__)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not logger.isEnabledFor(level):
+                return method(self, *args, **kwargs)
+            with PhaseTimer(self.env, name, logger, level) as timer:
+                timer.count(records=len(self))
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -17,6 +17,7 @@
     'data': [
         'security/room_groups.xml',
         'security/ir.model.access.csv',
+        'views/booking_group.xml',
         'views/property.xml',
         'views/booking.xml',
         'views/room_booking_menu.xml',
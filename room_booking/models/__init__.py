@@ -3,4 +3,6 @@
 
 from . import property
 from . import booking
+from . import occupancy
+from . import booking_group
 
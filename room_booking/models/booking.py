@@ -1,14 +1,17 @@
-from odoo import models, fields, api
-from odoo.exceptions import ValidationError
+from odoo import models, fields, api, tools
+from odoo.exceptions import UserError, ValidationError
+
+# Order in which the room types are filled when rooms are assigned automatically
+ROOM_TYPE_FIT_ORDER = ['single', 'double', 'suite']
 
 class RoomBooking(models.Model):
     _name = 'room.booking'
     _description = 'Room Booking'
 
-    employee_id = fields.Many2one('hr.employee', string='Employee', required=True)
+    employee_id = fields.Many2one('hr.employee', string='Employee', required=True, index=True)
     manager_id = fields.Many2one('hr.employee', string='Manager')
-    room_id = fields.Many2one('room.property.room', string='Room', required=True)
-    property_id = fields.Many2one('room.property', string='Property', required=True)
+    room_id = fields.Many2one('room.property.room', string='Room', required=True, index=True)
+    property_id = fields.Many2one('room.property', string='Property', required=True, index=True)
     check_in = fields.Date(string='Check-in Date', required=True)
     check_out = fields.Date(string='Check-out Date', required=True)
     state = fields.Selection([
@@ -17,6 +20,82 @@ class RoomBooking(models.Model):
         ('checked_out', 'Checked Out')
     ], default='draft', string='Status')
 
+    _sql_constraints = [
+        ('check_dates', 'CHECK(check_out > check_in)', 'Check-out must be after check-in.'),
+        ('room_period_excl',
+         "EXCLUDE USING gist (room_id WITH =, daterange(check_in, check_out) WITH &&) WHERE (state != 'draft')",
+         'The room is already booked for these dates. Please select another room in the same property.'),
+    ]
+
+    def _auto_init(self):
+        # btree_gist provides the GiST operator class for room_id, needed by
+        # the exclusion constraint and the overlap index
+        self.env.cr.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        return super()._auto_init()
+
+    def init(self):
+        tools.create_index(
+            self.env.cr, 'room_booking_room_period_index', self._table,
+            ['room_id', 'daterange(check_in, check_out)'], method='gist',
+        )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        bookings = super().create(vals_list)
+        self.env['room.occupancy']._refresh(bookings)
+        return bookings
+
+    def write(self, vals):
+        res = super().write(vals)
+        if vals.keys() & {'room_id', 'property_id', 'check_in', 'check_out'}:
+            self.env['room.occupancy']._refresh(self)
+        return res
+
+    @api.model
+    def _create_group_bookings(self, property_id, employees, check_in, check_out, room_type=None):
+        """ Book a room of the property for every employee for the same stay.
+
+        Rooms are assigned first-fit, smallest room type first, among the rooms
+        returned by ``find_available``. The batch is validated up front with
+        set-based queries and all bookings are inserted with one ``create``.
+
+        :return: the created ``room.booking`` records
+        """
+        check_in = fields.Date.to_date(check_in)
+        check_out = fields.Date.to_date(check_out)
+        rooms = self.env['room.property.room'].find_available(property_id, check_in, check_out, room_type)
+        if not room_type:
+            rooms = rooms.filtered(lambda room: room.room_type in ROOM_TYPE_FIT_ORDER)
+            rooms = rooms.sorted(lambda room: ROOM_TYPE_FIT_ORDER.index(room.room_type))
+
+        already_booked = self.search([
+            ('employee_id', 'in', employees.ids),
+            ('check_in', '<', check_out),
+            ('check_out', '>', check_in),
+        ]).employee_id
+        if already_booked:
+            raise UserError(
+                "These employees already have a booking during this stay: %s"
+                % ", ".join(already_booked.mapped('name'))
+            )
+        if len(rooms) < len(employees):
+            raise UserError(
+                f"Only {len(rooms)} room(s) are available from {check_in} to {check_out} "
+                f"for {len(employees)} employee(s)."
+            )
+
+        return self.create([
+            {
+                'employee_id': employee.id,
+                'manager_id': employee.parent_id.id,
+                'room_id': room.id,
+                'property_id': property_id,
+                'check_in': check_in,
+                'check_out': check_out,
+            }
+            for employee, room in zip(employees, rooms)
+        ])
+
     @api.onchange('employee_id')
     def _onchange_employee_id(self):
         if self.employee_id:
@@ -60,22 +139,42 @@ class RoomBooking(models.Model):
 
     @api.constrains('room_id', 'check_in', 'check_out')
     def _check_double_booking(self):
-        for record in self:
-            if not record.room_id or not record.check_in or not record.check_out:
+        bookings = self.filtered(lambda b: b.room_id and b.check_in and b.check_out and b.check_out > b.check_in)
+        if not bookings:
+            return
+
+        # One overlap query for the whole batch, served by room_booking_room_period_index
+        self.flush_model(['room_id', 'check_in', 'check_out'])
+        self.env.cr.execute("""
+            SELECT booking.id, other.id
+              FROM room_booking booking
+              JOIN room_booking other
+                ON other.room_id = booking.room_id
+               AND other.id != booking.id
+               AND daterange(other.check_in, other.check_out) && daterange(booking.check_in, booking.check_out)
+             WHERE booking.id IN %s
+          ORDER BY booking.id, other.check_in
+        """, [tuple(bookings.ids)])
+
+        rows = self.env.cr.fetchall()
+        records = {record.id: record for record in self.browse({id_ for row in rows for id_ in row})}
+        conflicts = []
+        reported = set()
+        for booking_id, other_id in rows:
+            if (other_id, booking_id) in reported:
                 continue
+            reported.add((booking_id, other_id))
+            booking, other = records[booking_id], records[other_id]
+            conflicts.append(
+                f"- '{booking.room_id.name}' from {booking.check_in} to {booking.check_out} "
+                f"overlaps the booking from {other.check_in} to {other.check_out}"
+            )
 
-            overlapping = self.env['room.booking'].search([
-                ('id', '!=', record.id),
-                ('room_id', '=', record.room_id.id),
-                ('check_in', '<', record.check_out),
-                ('check_out', '>', record.check_in),
-            ], limit=1)
-
-            if overlapping:
-                raise ValidationError(
-                    f"The room '{record.room_id.name}' is already booked. Please select another room in the same property to check availability"
-                    f"from {overlapping.check_in} to {overlapping.check_out}."
-                )
+        if conflicts:
+            raise ValidationError(
+                "These rooms are already booked. Please select another room in the same property to check availability:\n"
+                + "\n".join(conflicts)
+            )
 
     @api.constrains('check_in', 'check_out')
     def _check_date_order(self):
@@ -0,0 +1,40 @@
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+
+
+class RoomBookingGroupWizard(models.TransientModel):
+    _name = 'room.booking.group.wizard'
+    _description = 'Book Rooms for a Group of Employees'
+
+    property_id = fields.Many2one('room.property', string='Property', required=True)
+    check_in = fields.Date(string='Check-in Date', required=True)
+    check_out = fields.Date(string='Check-out Date', required=True)
+    room_type = fields.Selection(
+        [
+            ('single', 'Single'),
+            ('double', 'Double'),
+            ('suite', 'Suite'),
+        ],
+        string='Room Type',
+        help="Leave empty to fill the smallest available rooms first"
+    )
+    employee_ids = fields.Many2many('hr.employee', string='Employees')
+
+    @api.constrains('check_in', 'check_out')
+    def _check_date_order(self):
+        for record in self:
+            if record.check_in and record.check_out and record.check_out <= record.check_in:
+                raise ValidationError("Check-out must be after check-in.")
+
+    def action_create_bookings(self):
+        self.ensure_one()
+        bookings = self.env['room.booking']._create_group_bookings(
+            self.property_id.id, self.employee_ids, self.check_in, self.check_out, self.room_type,
+        )
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Group Bookings',
+            'res_model': 'room.booking',
+            'view_mode': 'tree,form,calendar',
+            'domain': [('id', 'in', bookings.ids)],
+        }
@@ -0,0 +1,41 @@
+from odoo import models, fields, api, tools
+
+
+class RoomOccupancy(models.Model):
+    _name = 'room.occupancy'
+    _description = 'Room Occupancy Calendar'
+    _log_access = False
+    _order = 'day'
+
+    room_id = fields.Many2one('room.property.room', string='Room', required=True, ondelete='cascade')
+    property_id = fields.Many2one('room.property', string='Property', required=True, ondelete='cascade')
+    booking_id = fields.Many2one('room.booking', string='Booking', required=True, ondelete='cascade', index=True)
+    day = fields.Date(string='Day', required=True)
+
+    def init(self):
+        tools.create_index(self.env.cr, 'room_occupancy_room_day_index', self._table, ['room_id', 'day'])
+        tools.create_index(self.env.cr, 'room_occupancy_property_day_index', self._table, ['property_id', 'day'])
+
+        # Fill the calendar with the bookings made before it existed
+        self.env.cr.execute("SELECT 1 FROM room_occupancy LIMIT 1")
+        if not self.env.cr.fetchone():
+            self.env.cr.execute("SELECT id FROM room_booking")
+            self._refresh(self.env['room.booking'].browse([row[0] for row in self.env.cr.fetchall()]))
+
+    @api.model
+    def _refresh(self, bookings):
+        """ Rebuild the occupied days of ``bookings``, one row per room and
+        night, from the booking table. """
+        if not bookings:
+            return
+        self.env['room.booking'].flush_model(['room_id', 'property_id', 'check_in', 'check_out'])
+        self.env.cr.execute("DELETE FROM room_occupancy WHERE booking_id IN %s", [tuple(bookings.ids)])
+        self.env.cr.execute("""
+            INSERT INTO room_occupancy (room_id, property_id, booking_id, day)
+                 SELECT booking.room_id, booking.property_id, booking.id, night::date
+                   FROM room_booking booking,
+                        generate_series(booking.check_in, booking.check_out - 1, interval '1 day') AS night
+                  WHERE booking.id IN %s
+                    AND booking.check_out > booking.check_in
+        """, [tuple(bookings.ids)])
+        self.invalidate_model()
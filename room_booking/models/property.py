@@ -1,4 +1,5 @@
 from odoo import models, fields, api
+from odoo.exceptions import ValidationError
 
 class RoomProperty(models.Model):
     _name = 'room.property'
@@ -31,9 +32,41 @@ class PropertyRoom(models.Model):
         string='Room Type',
         required=True
     )
-    property_id = fields.Many2one('room.property', string='Property', required=True)
+    property_id = fields.Many2one('room.property', string='Property', required=True, index=True)
     property_name = fields.Char(related='property_id.name', string='Property Name', store=True)
 
+    @api.model
+    def find_available(self, property_id, check_in, check_out, room_type=None):
+        """ Return the rooms of the property that are free every night from
+        ``check_in`` to ``check_out`` (excluded), optionally restricted to one
+        ``room_type``, in a single query on the occupancy calendar. """
+        check_in = fields.Date.to_date(check_in)
+        check_out = fields.Date.to_date(check_out)
+        if not check_in or not check_out or check_out <= check_in:
+            raise ValidationError("Check-out must be after check-in.")
+
+        self.env['room.occupancy'].flush_model()
+        self.env.cr.execute("""
+            SELECT room.id
+              FROM room_property_room room
+             WHERE room.property_id = %(property_id)s
+               AND (%(room_type)s IS NULL OR room.room_type = %(room_type)s)
+               AND NOT EXISTS (
+                       SELECT 1
+                         FROM room_occupancy occupancy
+                        WHERE occupancy.room_id = room.id
+                          AND occupancy.day >= %(check_in)s
+                          AND occupancy.day < %(check_out)s
+                   )
+          ORDER BY room.name, room.id
+        """, {
+            'property_id': property_id,
+            'room_type': room_type or None,
+            'check_in': check_in,
+            'check_out': check_out,
+        })
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
     def name_get(self):
         return [(rec.id, f"{rec.name} ({rec.property_id.name})") for rec in self]
 
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import Command, fields
+from odoo.exceptions import ValidationError
+from odoo.tests import tagged
+from odoo.tools import date_utils
+from odoo.addons.base_perf_tools.tests.common import QueryCountCase
+
+
+@tagged('post_install', '-at_install')
+class TestPerformance(QueryCountCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.check_in = date_utils.add(fields.Date.today(), days=7)
+
+    def _create_bookings(self, size):
+        employees = self.env['hr.employee'].create([
+            {'name': f"Perf Guest {size} {index}"}
+            for index in range(size)
+        ])
+        house = self.env['room.property'].create({
+            'name': f"Perf House {size}",
+            'property_type': 'owned',
+            'room_ids': [
+                Command.create({'name': f"Room {index}", 'room_type': 'single'})
+                for index in range(size // 2)
+            ],
+        })
+        rooms = house.room_ids
+        # Every room is booked twice, for back-to-back stays
+        return self.env['room.booking'].create([
+            {
+                'employee_id': employee.id,
+                'room_id': rooms[index % len(rooms)].id,
+                'property_id': house.id,
+                'check_in': date_utils.add(self.check_in, days=index // len(rooms) * 3),
+                'check_out': date_utils.add(self.check_in, days=index // len(rooms) * 3 + 3),
+            }
+            for index, employee in enumerate(employees)
+        ])
+
+    def test_double_booking(self):
+        bookings = self.assertStableQueryCount(3, self._create_bookings, lambda bookings: bookings._check_double_booking())
+
+        booking = bookings[self.SIZES[0]][0]
+        with self.assertRaises(ValidationError):
+            self.env['room.booking'].create({
+                'employee_id': booking.employee_id.id,
+                'room_id': booking.room_id.id,
+                'property_id': booking.property_id.id,
+                'check_in': date_utils.add(self.check_in, days=1),
+                'check_out': date_utils.add(self.check_in, days=2),
+            })
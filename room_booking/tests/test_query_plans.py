@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from datetime import timedelta
+
+from odoo import Command, fields
+from odoo.tests import TransactionCase, tagged
+from odoo.addons.base_perf_tools.tools.explain import check_query_plans
+
+
+@tagged('post_install', '-at_install')
+class TestQueryPlans(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        employee = cls.env['hr.employee'].create({'name': "Plans Employee"})
+        prop = cls.env['room.property'].create({
+            'name': "Plans House",
+            'property_type': 'owned',
+            'room_ids': [
+                Command.create({'name': f"Room {index}", 'room_type': 'single'})
+                for index in range(3)
+            ],
+        })
+        today = fields.Date.today()
+        cls.env['room.booking'].create([
+            {
+                'employee_id': employee.id,
+                'property_id': prop.id,
+                'room_id': room.id,
+                'check_in': today,
+                'check_out': today + timedelta(days=2),
+                'state': 'confirmed',
+            }
+            for room in prop.room_ids
+        ])
+
+    def test_query_shapes_use_indexes(self):
+        self.assertEqual(check_query_plans(self.env, 'room_booking'), {})
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+""" Benchmarks of the hot paths of the room booking module, run by
+``base_perf_tools.tools.benchmark.run_suite``. """
+from odoo import Command, fields
+from odoo.tools import date_utils
+from odoo.addons.base_perf_tools.tools.benchmark import measure
+
+
+def bench_group_booking(env, employees=500):
+    """ Time ``room.booking._create_group_bookings`` booking ``employees`` new
+    employees into a property with as many rooms. """
+    staff = env['hr.employee'].create([{'name': f"Bench Guest {index}"} for index in range(employees)])
+    room_types = ['single', 'double', 'suite']
+    house = env['room.property'].create({
+        'name': "Bench House",
+        'property_type': 'owned',
+        'room_ids': [
+            Command.create({'name': f"Room {index}", 'room_type': room_types[index % len(room_types)]})
+            for index in range(employees)
+        ],
+    })
+    check_in = date_utils.add(fields.Date.today(), days=7)
+    check_out = date_utils.add(check_in, days=3)
+    return measure(
+        env, 'group_booking',
+        lambda: env['room.booking']._create_group_bookings(house.id, staff, check_in, check_out),
+        employees,
+    )
+
+
+def bench_double_booking(env, bookings=1000):
+    """ Time ``room.booking._check_double_booking`` on ``bookings`` bookings,
+    every room being booked twice for back-to-back stays. """
+    staff = env['hr.employee'].create([{'name': f"Bench Guest {index}"} for index in range(bookings)])
+    house = env['room.property'].create({
+        'name': "Bench House",
+        'property_type': 'owned',
+        'room_ids': [
+            Command.create({'name': f"Room {index}", 'room_type': 'single'})
+            for index in range(bookings // 2 or 1)
+        ],
+    })
+    rooms = house.room_ids
+    check_in = date_utils.add(fields.Date.today(), days=7)
+    records = env['room.booking'].create([
+        {
+            'employee_id': employee.id,
+            'room_id': rooms[index % len(rooms)].id,
+            'property_id': house.id,
+            'check_in': date_utils.add(check_in, days=index // len(rooms) * 3),
+            'check_out': date_utils.add(check_in, days=index // len(rooms) * 3 + 3),
+        }
+        for index, employee in enumerate(staff)
+    ])
+    return measure(env, 'double_booking', records._check_double_booking, bookings)
+
+
+# (benchmark, keyword argument set to the scale, other arguments)
+SUITE = [
+    (bench_group_booking, 'employees', {}),
+    (bench_double_booking, 'bookings', {}),
+]
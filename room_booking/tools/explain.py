@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+""" Lookups of the room booking module and its record rules, checked by
+``base_perf_tools.tools.explain.check_query_plans``. """
+
+QUERY_SHAPES = {
+    'booking_by_room': (
+        "SELECT id FROM room_booking WHERE room_id = %s",
+        [0],
+    ),
+    'booking_overlap_by_room': (
+        "SELECT id FROM room_booking WHERE room_id = %s AND daterange(check_in, check_out) && daterange(%s, %s) AND state != 'draft'",
+        [0, '2000-01-01', '2000-01-02'],
+    ),
+    'booking_by_employee': (
+        "SELECT id FROM room_booking WHERE employee_id = %s",
+        [0],
+    ),
+    'booking_by_property': (
+        "SELECT id FROM room_booking WHERE property_id = %s",
+        [0],
+    ),
+    'occupancy_by_room_day': (
+        "SELECT id FROM room_occupancy WHERE room_id = %s AND day BETWEEN %s AND %s",
+        [0, '2000-01-01', '2000-01-02'],
+    ),
+    'occupancy_by_property_day': (
+        "SELECT id FROM room_occupancy WHERE property_id = %s AND day BETWEEN %s AND %s",
+        [0, '2000-01-01', '2000-01-02'],
+    ),
+    'room_by_property': (
+        "SELECT id FROM room_property_room WHERE property_id = %s",
+        [0],
+    ),
+}
+